@@ -2,41 +2,39 @@
 Add benchmarks for Medicare_CCR and Bad_Debt_Charity_Pct
 
 These two KPIs were added after the initial benchmark computation,
-so we need to generate benchmarks for them.
+so we need to generate benchmarks for them. KPIs that already have
+benchmarks are skipped; pass --refresh to recompute them.
 """
 
+import sys
 import duckdb
-import pandas as pd
 from pathlib import Path
 
 DB_PATH = 'data/hospital_analytics.duckdb'
 
+# Recompute benchmarks for KPIs that already have them (e.g. after rebuilding hospital_kpis)
+REFRESH = '--refresh' in sys.argv
+
 print("=" * 80)
 print("Adding Benchmarks for Missing KPIs")
 print("=" * 80)
 print()
 
-def classify_hospital_type(ccn):
-    """Classify hospital type by CCN range"""
-    if not ccn or len(str(ccn)) != 6:
-        return 'Unknown'
-
-    provider_num = int(str(ccn)[2:])
-
-    if 1 <= provider_num <= 899:
-        return 'Short Term Acute Care'
-    elif 3300 <= provider_num <= 3399:
-        return "Children's"
-    elif 1300 <= provider_num <= 1399:
-        return 'Critical Access'
-    elif 2000 <= provider_num <= 2299:
-        return 'Long Term'
-    elif 4000 <= provider_num <= 4499:
-        return 'Psychiatric'
-    elif 3025 <= provider_num <= 3099:
-        return 'Rehabilitation'
-    else:
-        return 'Other'
+# Hospital type by CCN range; the ranges only look at the last 4 digits of the
+# 6-digit CCN (ccn % 10000) and are checked in order. Missing or longer CCNs
+# are 'Unknown'. Expects a numeric ccn column.
+HOSPITAL_TYPE_SQL = """
+    CASE
+        WHEN ccn IS NULL OR ccn > 999999 THEN 'Unknown'
+        WHEN ccn % 10000 BETWEEN 1 AND 899 THEN 'Short Term Acute Care'
+        WHEN ccn % 10000 BETWEEN 3300 AND 3399 THEN 'Children''s'
+        WHEN ccn % 10000 BETWEEN 1300 AND 1399 THEN 'Critical Access'
+        WHEN ccn % 10000 BETWEEN 2000 AND 2299 THEN 'Long Term'
+        WHEN ccn % 10000 BETWEEN 4000 AND 4499 THEN 'Psychiatric'
+        WHEN ccn % 10000 BETWEEN 3025 AND 3099 THEN 'Rehabilitation'
+        ELSE 'Other'
+    END
+"""
 
 con = duckdb.connect(DB_PATH)
 
@@ -54,164 +52,117 @@ metadata_exists = con.execute("""
 
 if not metadata_exists:
     print("Creating hospital_metadata table...")
-    # Get state codes from balance sheet
-    state_codes = con.execute("""
-        SELECT DISTINCT Provider_Number, State_Code
-        FROM balance_sheet
-    """).df()
-
-    # Add hospital type classification
-    print("Classifying hospital types...")
-    state_codes['Hospital_Type'] = state_codes['Provider_Number'].apply(
-        lambda x: classify_hospital_type(str(int(x)).zfill(6))
-    )
-
-    # Create hospital metadata table
-    con.register('hospital_metadata_temp', state_codes)
-    con.execute("""
+    # Classify hospital types in SQL from the balance sheet providers, keeping
+    # one row per provider (the lowest State_Code if a provider has several)
+    con.execute(f"""
         CREATE TABLE hospital_metadata AS
-        SELECT * FROM hospital_metadata_temp
+        SELECT
+            Provider_Number,
+            State_Code,
+            {HOSPITAL_TYPE_SQL} AS Hospital_Type
+        FROM (
+            SELECT
+                Provider_Number,
+                MIN(State_Code) as State_Code,
+                TRY_CAST(Provider_Number AS BIGINT) as ccn
+            FROM balance_sheet
+            GROUP BY Provider_Number
+        )
     """)
     con.execute("CREATE INDEX idx_meta_provider ON hospital_metadata(Provider_Number)")
-    print(f"Hospital metadata: {len(state_codes):,} hospitals classified")
+    hospital_count = con.execute("SELECT COUNT(*) FROM hospital_metadata").fetchone()[0]
+    print(f"Hospital metadata: {hospital_count:,} hospitals classified")
     print()
 
-# Get available years and states
-years = con.execute("SELECT DISTINCT Fiscal_Year FROM hospital_kpis ORDER BY Fiscal_Year").df()['Fiscal_Year'].tolist()
-states = con.execute("SELECT DISTINCT State_Code FROM hospital_metadata WHERE State_Code IS NOT NULL").df()['State_Code'].tolist()
-hosp_types = con.execute("SELECT DISTINCT Hospital_Type FROM hospital_metadata WHERE Hospital_Type IS NOT NULL").df()['Hospital_Type'].tolist()
-
-print(f"Found: {len(years)} years, {len(states)} states, {len(hosp_types)} hospital types")
-print()
-
-benchmark_dfs = []
-total_benchmarks = 0
-
-for kpi in missing_kpis:
-    print(f"Computing benchmarks for {kpi}...")
-
-    # NATIONAL BENCHMARKS
-    print(f"  - National benchmarks...")
-    for year in years:
-        stats = con.execute(f"""
-            SELECT
-                '{kpi}' as KPI_Name,
-                'National' as Benchmark_Level,
-                NULL as State_Code,
-                NULL as Hospital_Type,
-                {year} as Fiscal_Year,
-                COUNT(*) as Provider_Count,
-                PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY {kpi}) as P25,
-                PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY {kpi}) as Median,
-                PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY {kpi}) as P75,
-                AVG({kpi}) as Mean
-            FROM hospital_kpis
-            WHERE Fiscal_Year = {year} AND {kpi} IS NOT NULL
-        """).df()
-        if len(stats) > 0 and stats['Provider_Count'].iloc[0] > 0:
-            benchmark_dfs.append(stats)
-            total_benchmarks += 1
-
-    # STATE BENCHMARKS
-    print(f"  - State benchmarks...")
-    for state in states:
-        for year in years:
-            stats = con.execute(f"""
-                SELECT
-                    '{kpi}' as KPI_Name,
-                    'State' as Benchmark_Level,
-                    '{state}' as State_Code,
-                    NULL as Hospital_Type,
-                    {year} as Fiscal_Year,
-                    COUNT(*) as Provider_Count,
-                    PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY k.{kpi}) as P25,
-                    PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY k.{kpi}) as Median,
-                    PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY k.{kpi}) as P75,
-                    AVG(k.{kpi}) as Mean
-                FROM hospital_kpis k
-                JOIN hospital_metadata m ON k.Provider_Number = m.Provider_Number
-                WHERE k.Fiscal_Year = {year} AND m.State_Code = '{state}' AND k.{kpi} IS NOT NULL
-            """).df()
-            if len(stats) > 0 and stats['Provider_Count'].iloc[0] > 0:
-                benchmark_dfs.append(stats)
-                total_benchmarks += 1
-
-    # HOSPITAL TYPE BENCHMARKS
-    print(f"  - Hospital type benchmarks...")
-    for hosp_type in hosp_types:
-        for year in years:
-            # Escape single quotes in hospital type name
-            hosp_type_escaped = hosp_type.replace("'", "''")
-            stats = con.execute(f"""
-                SELECT
-                    '{kpi}' as KPI_Name,
-                    'Hospital_Type' as Benchmark_Level,
-                    NULL as State_Code,
-                    '{hosp_type_escaped}' as Hospital_Type,
-                    {year} as Fiscal_Year,
-                    COUNT(*) as Provider_Count,
-                    PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY k.{kpi}) as P25,
-                    PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY k.{kpi}) as Median,
-                    PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY k.{kpi}) as P75,
-                    AVG(k.{kpi}) as Mean
-                FROM hospital_kpis k
-                JOIN hospital_metadata m ON k.Provider_Number = m.Provider_Number
-                WHERE k.Fiscal_Year = {year} AND m.Hospital_Type = '{hosp_type_escaped}' AND k.{kpi} IS NOT NULL
-            """).df()
-            if len(stats) > 0 and stats['Provider_Count'].iloc[0] > 0:
-                benchmark_dfs.append(stats)
-                total_benchmarks += 1
-
-    # STATE + HOSPITAL TYPE BENCHMARKS
-    print(f"  - State + hospital type benchmarks...")
-    for state in states:
-        for hosp_type in hosp_types:
-            for year in years:
-                # Escape single quotes in hospital type name
-                hosp_type_escaped = hosp_type.replace("'", "''")
-                stats = con.execute(f"""
-                    SELECT
-                        '{kpi}' as KPI_Name,
-                        'State_Hospital_Type' as Benchmark_Level,
-                        '{state}' as State_Code,
-                        '{hosp_type_escaped}' as Hospital_Type,
-                        {year} as Fiscal_Year,
-                        COUNT(*) as Provider_Count,
-                        PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY k.{kpi}) as P25,
-                        PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY k.{kpi}) as Median,
-                        PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY k.{kpi}) as P75,
-                        AVG(k.{kpi}) as Mean
-                    FROM hospital_kpis k
-                    JOIN hospital_metadata m ON k.Provider_Number = m.Provider_Number
-                    WHERE k.Fiscal_Year = {year}
-                        AND m.State_Code = '{state}'
-                        AND m.Hospital_Type = '{hosp_type_escaped}'
-                        AND k.{kpi} IS NOT NULL
-                """).df()
-                if len(stats) > 0 and stats['Provider_Count'].iloc[0] > 0:
-                    benchmark_dfs.append(stats)
-                    total_benchmarks += 1
-
-    print(f"  Completed {kpi}")
-    print()
-
-# Combine all benchmarks
-print(f"Combining {total_benchmarks} benchmark records...")
-all_benchmarks = pd.concat(benchmark_dfs, ignore_index=True)
-
-# Convert State_Code to INTEGER
-print("Converting State_Code to INTEGER...")
-all_benchmarks['State_Code'] = all_benchmarks['State_Code'].apply(
-    lambda x: int(x) if pd.notna(x) else None
+# Only compute benchmarks for KPIs that don't have any yet, so re-running the
+# script after adding a KPI leaves the existing benchmark rows untouched
+if REFRESH:
+    con.execute("DELETE FROM hospital_benchmarks WHERE list_contains(?, KPI_Name)", [missing_kpis])
+    kpis_to_compute = missing_kpis
+else:
+    existing_kpis = {
+        row[0] for row in con.execute(
+            "SELECT DISTINCT KPI_Name FROM hospital_benchmarks WHERE list_contains(?, KPI_Name)",
+            [missing_kpis]
+        ).fetchall()
+    }
+    kpis_to_compute = [kpi for kpi in missing_kpis if kpi not in existing_kpis]
+
+if not kpis_to_compute:
+    print("Benchmarks already exist for all KPIs (run with --refresh to recompute them)")
+    con.close()
+    sys.exit(0)
+
+print(f"Computing benchmarks for: {', '.join(kpis_to_compute)}...")
+
+# Unpivot the missing KPIs into (Provider_Number, Fiscal_Year, KPI_Name, KPI_Value)
+# rows so one GROUP BY covers every KPI and year
+kpi_values_sql = "\n    UNION ALL\n    ".join(
+    f"SELECT Provider_Number, Fiscal_Year, '{kpi}' AS KPI_Name, {kpi} AS KPI_Value "
+    f"FROM hospital_kpis WHERE {kpi} IS NOT NULL"
+    for kpi in kpis_to_compute
 )
 
-# Insert into hospital_benchmarks table
+# GROUPING SETS computes all four benchmark levels (National, State,
+# Hospital_Type, State_Hospital_Type) in a single scan of hospital_kpis.
+# GROUPING(col) is 1 when col is rolled up for that set, which identifies the
+# level; groups for hospitals with no State_Code/Hospital_Type are dropped.
+# approx_quantile computes all three quartiles from one t-digest per group
+# instead of sorting each group's values (PERCENTILE_CONT).
+# The rows are inserted straight into hospital_benchmarks, so the results never
+# round-trip through pandas. The metadata is narrowed to one row per provider
+# before the join (a hospital_metadata built elsewhere may hold several), so
+# no provider's values are counted twice at any level.
 print("Inserting into hospital_benchmarks table...")
-con.register('new_benchmarks', all_benchmarks)
-con.execute("""
+total_benchmarks = con.execute(f"""
     INSERT INTO hospital_benchmarks
-    SELECT * FROM new_benchmarks
-""")
+    SELECT
+        KPI_Name,
+        CASE
+            WHEN state_rolled_up = 0 AND type_rolled_up = 0 THEN 'State_Hospital_Type'
+            WHEN state_rolled_up = 0 THEN 'State'
+            WHEN type_rolled_up = 0 THEN 'Hospital_Type'
+            ELSE 'National'
+        END as Benchmark_Level,
+        TRY_CAST(State_Code AS INTEGER) as State_Code,
+        Hospital_Type,
+        Fiscal_Year,
+        Provider_Count,
+        quartiles[1] as P25,
+        quartiles[2] as Median,
+        quartiles[3] as P75,
+        Mean
+    FROM (
+        SELECT
+            k.KPI_Name,
+            m.State_Code,
+            m.Hospital_Type,
+            k.Fiscal_Year,
+            GROUPING(m.State_Code) as state_rolled_up,
+            GROUPING(m.Hospital_Type) as type_rolled_up,
+            COUNT(*) as Provider_Count,
+            approx_quantile(k.KPI_Value, [0.25, 0.50, 0.75]) as quartiles,
+            AVG(k.KPI_Value) as Mean
+        FROM ({kpi_values_sql}) k
+        LEFT JOIN (
+            SELECT Provider_Number, State_Code, Hospital_Type
+            FROM hospital_metadata
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY Provider_Number ORDER BY State_Code, Hospital_Type
+            ) = 1
+        ) m ON k.Provider_Number = m.Provider_Number
+        GROUP BY GROUPING SETS (
+            (k.KPI_Name, k.Fiscal_Year),
+            (k.KPI_Name, k.Fiscal_Year, m.State_Code),
+            (k.KPI_Name, k.Fiscal_Year, m.Hospital_Type),
+            (k.KPI_Name, k.Fiscal_Year, m.State_Code, m.Hospital_Type)
+        )
+    )
+    WHERE (state_rolled_up = 1 OR State_Code IS NOT NULL)
+      AND (type_rolled_up = 1 OR Hospital_Type IS NOT NULL)
+""").fetchone()[0]
+
+print(f"Computed {total_benchmarks} benchmark records")
 
 con.commit()
 con.close()
@@ -220,16 +171,16 @@ print()
 print("=" * 80)
 print("COMPLETE!")
 print("=" * 80)
-print(f"Added {total_benchmarks} benchmark records for {len(missing_kpis)} KPIs")
+print(f"Added {total_benchmarks} benchmark records for {len(kpis_to_compute)} KPIs")
 print()
 print("Verification:")
+con2 = duckdb.connect(DB_PATH, read_only=True)
 for kpi in missing_kpis:
-    con2 = duckdb.connect(DB_PATH, read_only=True)
-    count = con2.execute(f"""
-        SELECT COUNT(*) FROM hospital_benchmarks WHERE KPI_Name = '{kpi}'
-    """).fetchone()[0]
+    count = con2.execute(
+        "SELECT COUNT(*) FROM hospital_benchmarks WHERE KPI_Name = ?", [kpi]
+    ).fetchone()[0]
     print(f"  {kpi}: {count} benchmarks")
-    con2.close()
+con2.close()
 
 print()
 print("Next step: Restart the dashboard to see the new benchmarks!")
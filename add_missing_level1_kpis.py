@@ -9,8 +9,6 @@ Formulas from to_do.txt:
 """
 
 import duckdb
-import pandas as pd
-from pathlib import Path
 
 DB_PATH = 'data/hospital_analytics.duckdb'
 WORKSHEET_DB_PATH = 'data/hospital_worksheets.duckdb'
@@ -23,16 +21,15 @@ print()
 # Connect to databases
 print("Connecting to databases...")
 analytics_con = duckdb.connect(DB_PATH)
-worksheet_con = duckdb.connect(WORKSHEET_DB_PATH, read_only=True)
+analytics_con.execute(f"ATTACH '{WORKSHEET_DB_PATH}' AS ws (READ_ONLY)")
 
-# Get list of all providers and fiscal years from existing data
-existing_data = analytics_con.execute("""
-    SELECT DISTINCT Provider_Number, Fiscal_Year
-    FROM hospital_kpis
-    ORDER BY Provider_Number, Fiscal_Year DESC
-""").df()
+# Count provider-years in the existing data
+provider_year_count = analytics_con.execute("""
+    SELECT COUNT(*)
+    FROM (SELECT DISTINCT Provider_Number, Fiscal_Year FROM hospital_kpis)
+""").fetchone()[0]
 
-print(f"Found {len(existing_data)} provider-year combinations to process")
+print(f"Found {provider_year_count} provider-year combinations to process")
 print()
 
 # First, check if columns exist, if not add them
@@ -59,98 +56,81 @@ print()
 medicare_ccr_count = 0
 bad_debt_charity_count = 0
 
-for idx, row in existing_data.iterrows():
-    provider = row['Provider_Number']
-    fiscal_year = row['Fiscal_Year']
-
-    if idx % 50 == 0:
-        print(f"Processing {idx+1}/{len(existing_data)}: Provider {provider}, FY {fiscal_year}")
-
-    # Calculate Medicare CCR from Worksheet C
-    # Formula: Total Costs (Col 5) / Total Charges (Col 8)
-    try:
-        # Get total costs from worksheet_c000001 where Column like '%00500%' (Column 5)
-        total_costs = worksheet_con.execute("""
-            SELECT SUM(Value) as total_costs
-            FROM worksheet_c000001
-            WHERE Provider_Number = ?
-              AND fiscal_year = ?
-              AND "Column" LIKE '%00500%'
-              AND Value IS NOT NULL
-              AND Value > 0
-        """, [str(provider), int(fiscal_year)]).fetchone()
-
-        # Get total charges from worksheet_c000001 where Column like '%00800%' (Column 8)
-        total_charges = worksheet_con.execute("""
-            SELECT SUM(Value) as total_charges
-            FROM worksheet_c000001
-            WHERE Provider_Number = ?
-              AND fiscal_year = ?
-              AND "Column" LIKE '%00800%'
-              AND Value IS NOT NULL
-              AND Value > 0
-        """, [str(provider), int(fiscal_year)]).fetchone()
-
-        if (total_costs and total_costs[0] and total_costs[0] > 0 and
-            total_charges and total_charges[0] and total_charges[0] > 0):
-            medicare_ccr = total_costs[0] / total_charges[0]
-
-            # Update the KPI in hospital_kpis table
-            analytics_con.execute("""
-                UPDATE hospital_kpis
-                SET Medicare_CCR = ?
-                WHERE Provider_Number = ? AND Fiscal_Year = ?
-            """, [medicare_ccr, int(provider), int(fiscal_year)])
-
-            medicare_ccr_count += 1
-
-    except Exception as e:
-        pass  # Silently skip if worksheet data not available
-
-    # Calculate Bad Debt + Charity % from Worksheet S-10 and G-3
-    # Formula: (S-10 Line 29 Col 3 + Line 23 Col 3) ÷ (G-3 Line 3 - Provisions)
-    try:
-        # Get bad debt and charity care from worksheet_s100001
-        # Line 02300 = Charity Care, Line 02900 = Bad Debt, Column 00300 = Amount
-        bad_debt_charity_data = worksheet_con.execute("""
+# Aggregate each worksheet once for all provider-years and apply the results
+# with a single UPDATE ... FROM; the worksheet database is attached so the
+# join runs entirely inside DuckDB. Each worksheet table is scanned once, so
+# no (Provider_Number, fiscal_year) index is needed on the read-only attach.
+# Provider numbers are matched with TRY_CAST so a non-numeric CCN only drops
+# its own row (NULL never matches) instead of aborting the whole UPDATE.
+try:
+    # Line and Column are stored as 5-character zero-padded codes, so match them
+    # with equality rather than substring LIKE patterns
+    # Column 00500 = Total Costs, Column 00800 = Total Charges
+    medicare_ccr_count = analytics_con.execute("""
+        UPDATE hospital_kpis
+        SET Medicare_CCR = ccr.total_costs / ccr.total_charges
+        FROM (
             SELECT
-                SUM(CASE WHEN (Line LIKE '%02300%' OR Line LIKE '%02900%') AND "Column" LIKE '%00300%'
-                    THEN Value ELSE 0 END) as bad_debt_charity
-            FROM worksheet_s100001
-            WHERE Provider_Number = ?
-              AND fiscal_year = ?
-              AND Value IS NOT NULL
-        """, [str(provider), int(fiscal_year)]).fetchone()
-
-        # Get net patient revenue from worksheet_g300000 (Statement of Revenues)
-        # Line 00300 typically contains net patient revenue
-        net_revenue_data = worksheet_con.execute("""
-            SELECT SUM(Value) as net_revenue
-            FROM worksheet_g300000
-            WHERE Provider_Number = ?
-              AND fiscal_year = ?
-              AND Line LIKE '%00300%'
-              AND "Column" LIKE '%00100%'
-              AND Value IS NOT NULL
+                Provider_Number,
+                fiscal_year,
+                SUM(CASE WHEN "Column" = '00500' THEN Value END) as total_costs,
+                SUM(CASE WHEN "Column" = '00800' THEN Value END) as total_charges
+            FROM ws.worksheet_c000001
+            WHERE Value IS NOT NULL
               AND Value > 0
-        """, [str(provider), int(fiscal_year)]).fetchone()
-
-        if (bad_debt_charity_data and bad_debt_charity_data[0] and bad_debt_charity_data[0] > 0 and
-            net_revenue_data and net_revenue_data[0] and net_revenue_data[0] > 0):
+            GROUP BY Provider_Number, fiscal_year
+        ) ccr
+        WHERE TRY_CAST(hospital_kpis.Provider_Number AS INTEGER) = TRY_CAST(ccr.Provider_Number AS INTEGER)
+          AND hospital_kpis.Fiscal_Year = ccr.fiscal_year
+          AND ccr.total_costs > 0
+          AND ccr.total_charges > 0
+    """).fetchone()[0]
 
-            bad_debt_charity_pct = (bad_debt_charity_data[0] / net_revenue_data[0]) * 100
+except Exception as e:
+    print(f"  - Skipping Medicare CCR, worksheet data not available: {e}")
 
-            # Update the KPI in hospital_kpis table
-            analytics_con.execute("""
-                UPDATE hospital_kpis
-                SET Bad_Debt_Charity_Pct = ?
-                WHERE Provider_Number = ? AND Fiscal_Year = ?
-            """, [bad_debt_charity_pct, int(provider), int(fiscal_year)])
+# Calculate Bad Debt + Charity % from Worksheet S-10 and G-3
+# Formula: (S-10 Line 29 Col 3 + Line 23 Col 3) ÷ (G-3 Line 3 - Provisions)
+print("Calculating Bad Debt + Charity %...")
+print()
 
-            bad_debt_charity_count += 1
+try:
+    # S-10: Line 02300 = Charity Care, Line 02900 = Bad Debt, Column 00300 = Amount
+    # G-3: Line 00300 typically contains net patient revenue
+    bad_debt_charity_count = analytics_con.execute("""
+        UPDATE hospital_kpis
+        SET Bad_Debt_Charity_Pct = (u.bad_debt_charity / n.net_revenue) * 100
+        FROM (
+            SELECT
+                Provider_Number,
+                fiscal_year,
+                SUM(CASE WHEN Line IN ('02300', '02900') AND "Column" = '00300'
+                    THEN Value ELSE 0 END) as bad_debt_charity
+            FROM ws.worksheet_s100001
+            WHERE Value IS NOT NULL
+            GROUP BY Provider_Number, fiscal_year
+        ) u
+        JOIN (
+            SELECT
+                Provider_Number,
+                fiscal_year,
+                SUM(Value) as net_revenue
+            FROM ws.worksheet_g300000
+            WHERE Line = '00300'
+              AND "Column" = '00100'
+              AND Value IS NOT NULL
+              AND Value > 0
+            GROUP BY Provider_Number, fiscal_year
+        ) n
+          ON u.Provider_Number = n.Provider_Number
+         AND u.fiscal_year = n.fiscal_year
+        WHERE TRY_CAST(hospital_kpis.Provider_Number AS INTEGER) = TRY_CAST(u.Provider_Number AS INTEGER)
+          AND hospital_kpis.Fiscal_Year = u.fiscal_year
+          AND u.bad_debt_charity > 0
+    """).fetchone()[0]
 
-    except Exception as e:
-        pass  # Silently skip if worksheet data not available
+except Exception as e:
+    print(f"  - Skipping Bad Debt + Charity %, worksheet data not available: {e}")
 
 # Commit changes
 analytics_con.commit()
@@ -164,7 +144,7 @@ print(f"Successfully calculated Bad Debt + Charity % for {bad_debt_charity_count
 print()
 
 # Verify the updates
-verification = analytics_con.execute("""
+total_records, ccr_records, bad_debt_records, avg_medicare_ccr, avg_bad_debt_charity = analytics_con.execute("""
     SELECT
         COUNT(*) as total_records,
         COUNT(Medicare_CCR) as medicare_ccr_count,
@@ -172,19 +152,18 @@ verification = analytics_con.execute("""
         AVG(Medicare_CCR) as avg_medicare_ccr,
         AVG(Bad_Debt_Charity_Pct) as avg_bad_debt_charity
     FROM hospital_kpis
-""").df()
+""").fetchone()
 
 print("Verification:")
-print(f"  Total records in hospital_kpis: {verification['total_records'].iloc[0]}")
-print(f"  Records with Medicare CCR: {verification['medicare_ccr_count'].iloc[0]}")
-print(f"  Records with Bad Debt + Charity %: {verification['bad_debt_charity_count'].iloc[0]}")
-print(f"  Average Medicare CCR: {verification['avg_medicare_ccr'].iloc[0]:.4f}" if verification['avg_medicare_ccr'].iloc[0] else "  Average Medicare CCR: N/A")
-print(f"  Average Bad Debt + Charity %: {verification['avg_bad_debt_charity'].iloc[0]:.2f}%" if verification['avg_bad_debt_charity'].iloc[0] else "  Average Bad Debt + Charity %: N/A")
+print(f"  Total records in hospital_kpis: {total_records}")
+print(f"  Records with Medicare CCR: {ccr_records}")
+print(f"  Records with Bad Debt + Charity %: {bad_debt_records}")
+print(f"  Average Medicare CCR: {avg_medicare_ccr:.4f}" if avg_medicare_ccr else "  Average Medicare CCR: N/A")
+print(f"  Average Bad Debt + Charity %: {avg_bad_debt_charity:.2f}%" if avg_bad_debt_charity else "  Average Bad Debt + Charity %: N/A")
 print()
 
-# Close connections
+# Close connection
 analytics_con.close()
-worksheet_con.close()
 
 print("Database updated successfully!")
 print()
@@ -14,13 +14,27 @@ Features:
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, Patch
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import flask
 from flask import session as flask_session
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+import numpy as np
+import os
+from plotly.io.json import to_json_plotly
 import secrets
+import threading
 
 from utils.logging_config import get_logger
+from utils.cache import LRUCache, QueryCache, cached_query
+from utils.kpi_helpers import calculate_dynamic_priorities, calculate_trend_pcts
+from components.kpi_cards import create_kpi_card
+from data.data_manager import HospitalDataManager
+from kpi_hierarchy_config import KPI_METADATA
 
 # Import authentication modules
 from auth_manager import auth_manager
@@ -33,100 +47,264 @@ from auth_components import (
     create_user_menu
 )
 
+logger = get_logger(__name__)
+
+# Shared data access for all dashboard callbacks. The constructor only locates
+# the database; the connection is opened on first query.
+data_manager = HospitalDataManager()
+
 # Initialize Flask server
 server = flask.Flask(__name__)
 server.secret_key = secrets.token_hex(32)  # Secret key for Flask sessions
 
+# FontAwesome is served from the app's own origin when the free web bundle is
+# unpacked under assets/fontawesome/ (Dash includes assets/ CSS automatically);
+# otherwise it falls back to the CDN
+FONTAWESOME_CDN = 'https://use.fontawesome.com/releases/v6.1.1/css/all.css'
+FONTAWESOME_LOCAL = Path(__file__).parent / 'assets' / 'fontawesome' / 'css' / 'all.min.css'
+
+EXTERNAL_STYLESHEETS = (
+    (dbc.themes.BOOTSTRAP,) if FONTAWESOME_LOCAL.exists()
+    else (dbc.themes.BOOTSTRAP, FONTAWESOME_CDN)
+)
+
 # Initialize Dash app with Bootstrap theme
 app = dash.Dash(
     __name__,
     server=server,
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        'https://use.fontawesome.com/releases/v6.1.1/css/all.css'
-    ],
+    external_stylesheets=list(EXTERNAL_STYLESHEETS),
     suppress_callback_exceptions=True,
     title="Hospital KPI Dashboard"
 )
 
+# The index HTML is identical for every visitor (the login state lives in the
+# browser's session store), so browsers and shared caches may reuse it for a
+# minute. /_dash-layout and /_dash-dependencies are left alone: they are not
+# fingerprinted, so a cached copy could outlive a deploy and no longer match
+# the callbacks the server registers.
+PUBLIC_CACHE_PATHS = frozenset({'/', '/register'})
+PUBLIC_CACHE_CONTROL = 'public, max-age=60'
+
+
+@server.after_request
+def add_public_cache_headers(response):
+    """Mark the static index HTML cacheable for visitors without a Flask session"""
+    request = flask.request
+    if (request.method == 'GET'
+            and request.path in PUBLIC_CACHE_PATHS
+            and response.status_code == 200
+            and server.config['SESSION_COOKIE_NAME'] not in request.cookies):
+        response.headers['Cache-Control'] = PUBLIC_CACHE_CONTROL
+        response.headers.pop('Set-Cookie', None)
+    return response
+
 # ============================================================================
 # LAYOUT
 # ============================================================================
 
-def get_authenticated_layout(user_info):
-    """Layout for authenticated users"""
-    return dbc.Container([
-        # Welcome Modal
-        dbc.Modal([
-            dbc.ModalHeader(dbc.ModalTitle([
-                html.I(className="fas fa-info-circle me-2"),
-                "Welcome to Hospital KPI Dashboard"
-            ])),
-            dbc.ModalBody([
-                html.H5("Your Comprehensive Healthcare Analytics Platform"),
-                html.P("This dashboard provides real-time insights into hospital financial performance using 78 hierarchical KPIs."),
-                html.Hr(),
-                html.H6("Key Features:"),
-                dbc.ListGroup([
-                    dbc.ListGroupItem([
-                        html.I(className="fas fa-chart-line me-2 text-primary"),
-                        html.Strong("3-Level KPI Hierarchy: "),
-                        "6 Strategic → 24 Driver → 48 Sub-driver metrics"
-                    ]),
-                    dbc.ListGroupItem([
-                        html.I(className="fas fa-balance-scale me-2 text-success"),
-                        html.Strong("Benchmark Comparisons: "),
-                        "Compare against National, State, and Hospital Type peers"
-                    ]),
-                    dbc.ListGroupItem([
-                        html.I(className="fas fa-exclamation-triangle me-2 text-warning"),
-                        html.Strong("Priority Ranking: "),
-                        "KPIs automatically ranked by performance gap and importance"
-                    ]),
-                    dbc.ListGroupItem([
-                        html.I(className="fas fa-chart-area me-2 text-info"),
-                        html.Strong("Trend Analysis: "),
-                        "Multi-year performance tracking with sparklines"
-                    ])
-                ], flush=True, className="mb-3"),
-                html.P("All KPIs are displayed below, ranked by priority. Use the sorting controls to view by performance gap or trend changes.",
-                       className="text-muted mb-0")
+# Static parts of the authenticated layout, built once at import time and
+# shared by every page render; only the user-specific parts are built per call
+
+def _to_plain_json(component):
+    """
+    Serialize a static component tree to plain dicts once
+
+    Dash renders component dicts directly, so embedding the result in a layout
+    skips walking and serializing the same component objects on every render.
+    """
+    return json.loads(to_json_plotly(component))
+
+
+_WELCOME_MODAL = _to_plain_json(dbc.Modal([
+    dbc.ModalHeader(dbc.ModalTitle([
+        html.I(className="fas fa-info-circle me-2"),
+        "Welcome to Hospital KPI Dashboard"
+    ])),
+    dbc.ModalBody([
+        html.H5("Your Comprehensive Healthcare Analytics Platform"),
+        html.P("This dashboard provides real-time insights into hospital financial performance using 78 hierarchical KPIs."),
+        html.Hr(),
+        html.H6("Key Features:"),
+        dbc.ListGroup([
+            dbc.ListGroupItem([
+                html.I(className="fas fa-chart-line me-2 text-primary"),
+                html.Strong("3-Level KPI Hierarchy: "),
+                "6 Strategic → 24 Driver → 48 Sub-driver metrics"
             ]),
-            dbc.ModalFooter(
-                dbc.Button("Get Started", id="close-welcome-modal", color="primary")
-            ),
-        ], id="welcome-modal", size="lg", is_open=True),
+            dbc.ListGroupItem([
+                html.I(className="fas fa-balance-scale me-2 text-success"),
+                html.Strong("Benchmark Comparisons: "),
+                "Compare against National, State, and Hospital Type peers"
+            ]),
+            dbc.ListGroupItem([
+                html.I(className="fas fa-exclamation-triangle me-2 text-warning"),
+                html.Strong("Priority Ranking: "),
+                "KPIs automatically ranked by performance gap and importance"
+            ]),
+            dbc.ListGroupItem([
+                html.I(className="fas fa-chart-area me-2 text-info"),
+                html.Strong("Trend Analysis: "),
+                "Multi-year performance tracking with sparklines"
+            ])
+        ], flush=True, className="mb-3"),
+        html.P("All KPIs are displayed below, ranked by priority. Use the sorting controls to view by performance gap or trend changes.",
+               className="text-muted mb-0")
+    ]),
+    dbc.ModalFooter(
+        dbc.Button("Get Started", id="close-welcome-modal", color="primary")
+    ),
+], id="welcome-modal", size="lg", is_open=True))
+
+_BENCHMARK_OPTIONS = [
+    {'label': 'National - All Hospitals', 'value': 'National'},
+    {'label': 'State - Same State', 'value': 'State'},
+    {'label': 'Hospital Type - Same Type', 'value': 'Hospital_Type'},
+    {'label': 'State + Type - Most Specific', 'value': 'State_Hospital_Type'}
+]
+
+_HOSPITAL_SELECTOR_ROW = dbc.Row([
+    dbc.Col([
+        html.H4("Select Hospital", className="mb-3"),
+        dcc.Dropdown(
+            id='auth-hospital-dropdown',
+            placeholder="Select a hospital...",
+            className="mb-4"
+        )
+    ], width=6),
+    dbc.Col([
+        html.H4("Benchmark Level", className="mb-3"),
+        dcc.Dropdown(
+            id='auth-benchmark-dropdown',
+            options=_BENCHMARK_OPTIONS,
+            value='State',
+            className="mb-4"
+        )
+    ], width=6)
+])
 
+_SELECT_HOSPITAL_ALERT = dbc.Alert([
+    html.I(className="fas fa-info-circle me-2"),
+    "Select a hospital above to view KPI analysis"
+], color="info")
+
+_SUMMARY_STATS_ROW = dbc.Row([
+    dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.H6("Hospital", className="text-muted mb-1"),
+                html.H4(id='auth-hospital-name', children="Select a hospital", className="mb-0")
+            ])
+        ], className="shadow-sm")
+    ], width=3),
+    dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.H6("Type", className="text-muted mb-1"),
+                html.H4(id='auth-hospital-type', children="N/A", className="mb-0")
+            ])
+        ], className="shadow-sm")
+    ], width=3),
+    dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.H6("Benchmark Group", className="text-muted mb-1"),
+                html.H4(id='auth-benchmark-group', children="N/A", className="mb-0")
+            ])
+        ], className="shadow-sm")
+    ], width=3),
+    dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.H6("Peer Hospitals", className="text-muted mb-1"),
+                html.H4(id='auth-peer-count', children="N/A", className="mb-0")
+            ])
+        ], className="shadow-sm")
+    ], width=3)
+], className="mb-4")
+
+_SORTING_CONTROLS = dbc.Row([
+    dbc.Col([
+        html.Label("Sort KPIs by:", className="me-2"),
+        dbc.ButtonGroup([
+            dbc.Button("Priority (Dynamic)", id='auth-sort-importance', color="primary", outline=False),
+            dbc.Button("Performance Gap", id='auth-sort-performance', color="primary", outline=True),
+            dbc.Button("Trend Change", id='auth-sort-trend', color="primary", outline=True),
+        ])
+    ], className="d-flex align-items-center")
+], className="mb-3")
+
+
+_NAVBAR_BRAND = _to_plain_json(dbc.Col([
+    html.A(
+        dbc.Row([
+            dbc.Col(html.I(className="fas fa-hospital-alt", style={'fontSize': '28px'})),
+            dbc.Col(dbc.NavbarBrand("Hospital KPI Dashboard", className="ms-2")),
+        ], align="center", className="g-0"),
+        href="/",
+        style={"textDecoration": "none"}
+    )
+], width="auto"))
+
+_NAVBAR_LINKS = [
+    _to_plain_json(dbc.NavItem(dbc.NavLink("Dashboard", href="/", active=True))),
+    _to_plain_json(dbc.NavItem(dbc.NavLink("Analytics", href="/analytics"))),
+    _to_plain_json(dbc.NavItem(dbc.NavLink("Reports", href="/reports")))
+]
+
+
+def create_navbar(user_info):
+    """Top navigation bar with the user menu for user_info"""
+    return dbc.Navbar(
+        dbc.Container([
+            dbc.Row([
+                _NAVBAR_BRAND,
+                dbc.Col([
+                    dbc.Nav(
+                        _NAVBAR_LINKS + [dbc.NavItem(create_user_menu(user_info))],
+                        navbar=True,
+                        className="ms-auto"
+                    )
+                ])
+            ], className="w-100", align="center")
+        ], fluid=True),
+        color="dark",
+        dark=True,
+        className="mb-4"
+    )
+
+
+# Loading placeholder that load_dashboard_body fills in
+_DASHBOARD_BODY_PLACEHOLDER = _to_plain_json(html.Div(id='auth-dashboard-body', children=dcc.Loading(
+    html.Div(id='auth-dashboard-body-inner'),
+    type="default"
+)))
+
+
+def get_authenticated_layout(user_info):
+    """Layout for authenticated users"""
+    return _build_authenticated_layout(
+        user_info['display_name'],
+        user_info['email'],
+        user_info['user_type']
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_authenticated_layout(display_name, email, user_type):
+    """
+    Build the authenticated page shell for the user fields it displays
+
+    Only the navbar and welcome message are rendered here; the dashboard body
+    is filled in by load_dashboard_body once the shell is on the page.
+    Memoized and pre-serialized so repeat renders for the same user skip both
+    building and serializing the component tree.
+    """
+    user_info = {'display_name': display_name, 'email': email, 'user_type': user_type}
+    return _to_plain_json(dbc.Container([
         # Main content
         dbc.Container([
         # Top navigation bar
-        dbc.Navbar(
-            dbc.Container([
-                dbc.Row([
-                    dbc.Col([
-                        html.A(
-                            dbc.Row([
-                                dbc.Col(html.I(className="fas fa-hospital-alt", style={'fontSize': '28px'})),
-                                dbc.Col(dbc.NavbarBrand("Hospital KPI Dashboard", className="ms-2")),
-                            ], align="center", className="g-0"),
-                            href="/",
-                            style={"textDecoration": "none"}
-                        )
-                    ], width="auto"),
-                    dbc.Col([
-                        dbc.Nav([
-                            dbc.NavItem(dbc.NavLink("Dashboard", href="/", active=True)),
-                            dbc.NavItem(dbc.NavLink("Analytics", href="/analytics")),
-                            dbc.NavItem(dbc.NavLink("Reports", href="/reports")),
-                            dbc.NavItem(create_user_menu(user_info))
-                        ], navbar=True, className="ms-auto")
-                    ])
-                ], className="w-100", align="center")
-            ], fluid=True),
-            color="dark",
-            dark=True,
-            className="mb-4"
-        ),
+        create_navbar(user_info),
 
         # Main content area
         dbc.Container([
@@ -143,91 +321,34 @@ def get_authenticated_layout(user_info):
                 ])
             ], color="success", className="mb-4"),
 
-            # Hospital Selector and Benchmark Controls
-            dbc.Row([
-                dbc.Col([
-                    html.H4("Select Hospital", className="mb-3"),
-                    dcc.Dropdown(
-                        id='auth-hospital-dropdown',
-                        placeholder="Select a hospital...",
-                        className="mb-4"
-                    )
-                ], width=6),
-                dbc.Col([
-                    html.H4("Benchmark Level", className="mb-3"),
-                    dcc.Dropdown(
-                        id='auth-benchmark-dropdown',
-                        options=[
-                            {'label': 'National - All Hospitals', 'value': 'National'},
-                            {'label': 'State - Same State', 'value': 'State'},
-                            {'label': 'Hospital Type - Same Type', 'value': 'Hospital_Type'},
-                            {'label': 'State + Type - Most Specific', 'value': 'State_Hospital_Type'}
-                        ],
-                        value='State',
-                        className="mb-4"
-                    )
-                ], width=6)
-            ]),
-
-            # Summary Stats
-            dbc.Row([
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.H6("Hospital", className="text-muted mb-1"),
-                            html.H4(id='auth-hospital-name', children="Select a hospital", className="mb-0")
-                        ])
-                    ], className="shadow-sm")
-                ], width=3),
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.H6("Type", className="text-muted mb-1"),
-                            html.H4(id='auth-hospital-type', children="N/A", className="mb-0")
-                        ])
-                    ], className="shadow-sm")
-                ], width=3),
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.H6("Benchmark Group", className="text-muted mb-1"),
-                            html.H4(id='auth-benchmark-group', children="N/A", className="mb-0")
-                        ])
-                    ], className="shadow-sm")
-                ], width=3),
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.H6("Peer Hospitals", className="text-muted mb-1"),
-                            html.H4(id='auth-peer-count', children="N/A", className="mb-0")
-                        ])
-                    ], className="shadow-sm")
-                ], width=3)
-            ], className="mb-4"),
-
-            # Sorting Controls
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Sort KPIs by:", className="me-2"),
-                    dbc.ButtonGroup([
-                        dbc.Button("Priority (Dynamic)", id='auth-sort-importance', color="primary", outline=False),
-                        dbc.Button("Performance Gap", id='auth-sort-performance', color="primary", outline=True),
-                        dbc.Button("Trend Change", id='auth-sort-trend', color="primary", outline=True),
-                    ])
-                ], className="d-flex align-items-center")
-            ], className="mb-3"),
-
-            # All KPI Cards
-            html.Div(id='auth-kpi-cards-container', children=[
-                dbc.Alert([
-                    html.I(className="fas fa-info-circle me-2"),
-                    "Select a hospital above to view KPI analysis"
-                ], color="info")
-            ])
+            # Dashboard body, loaded after the shell renders
+            _DASHBOARD_BODY_PLACEHOLDER
 
         ], fluid=True)
         ], fluid=True)
-    ], fluid=True)
+    ], fluid=True))
+
+
+# Heavy part of the authenticated page, returned by load_dashboard_body.
+# It is the same for every user, so it is built and serialized once.
+_DASHBOARD_BODY = _to_plain_json([
+    # Welcome Modal (lazy, opens once the body has loaded)
+    _WELCOME_MODAL,
+
+    # Hospital Selector and Benchmark Controls
+    _HOSPITAL_SELECTOR_ROW,
+
+    # Summary Stats
+    _SUMMARY_STATS_ROW,
+
+    # Sorting Controls
+    dcc.Store(id='auth-sort-mode', data='importance'),
+    _SORTING_CONTROLS,
+
+    # All KPI Cards (the first few are rendered first, the rest appended)
+    dcc.Store(id='auth-pending-kpis'),
+    html.Div(id='auth-kpi-cards-container', children=[_SELECT_HOSPITAL_ALERT])
+])
 
 
 app.layout = html.Div([
@@ -241,6 +362,36 @@ app.layout = html.Div([
 # ROUTING CALLBACKS
 # ============================================================================
 
+# User info resolved from session ids; display_page runs on every URL change,
+# so a short TTL saves re-querying the auth database on each navigation
+_session_user_cache = LRUCache(max_size=10000, ttl=60)
+
+
+def get_session_user_info(session_id):
+    """
+    Get the formatted user info for a session, cached for up to a minute
+
+    Returns: user_info dict (see AuthManager.get_user_info) or None
+    """
+    user_info = _session_user_cache.get(session_id)
+    if user_info is not None:
+        return user_info
+
+    user_dict, user_type = auth_manager.get_user_from_session(session_id)
+    if not (user_dict and user_type):
+        return None
+
+    user_info = auth_manager.get_user_info(user_type, user_dict)
+    _session_user_cache.set(session_id, user_info)
+    return user_info
+
+
+# Layout factories for unauthenticated routes; anything else shows the login page
+_PATH_MAP = {
+    '/register': create_register_layout,
+}
+
+
 @app.callback(
     Output('page-content', 'children'),
     Input('url', 'pathname'),
@@ -250,43 +401,101 @@ def display_page(pathname, session_data):
     """Route to appropriate page based on authentication status"""
 
     # Check if user is authenticated
-    if session_data and session_data.get('session_id'):
-        session_id = session_data['session_id']
-        user_dict, user_type = auth_manager.get_user_from_session(session_id)
-
-        if user_dict and user_type:
-            # User is authenticated
-            user_info = auth_manager.get_user_info(user_type, user_dict)
+    session_id = (session_data or {}).get('session_id')
+    if session_id:
+        user_info = get_session_user_info(session_id)
 
-            if pathname == '/register':
-                # Redirect authenticated users from register page
-                return get_authenticated_layout(user_info)
-            else:
-                return get_authenticated_layout(user_info)
+        if user_info:
+            # Authenticated users get the dashboard on every route, /register included
+            return get_authenticated_layout(user_info)
 
     # User not authenticated - show login or register
-    if pathname == '/register':
-        return create_register_layout()
-    else:
-        return create_login_layout()
+    return _PATH_MAP.get(pathname, create_login_layout)()
+
+
+@app.callback(
+    Output('auth-dashboard-body-inner', 'children'),
+    Input('url', 'pathname')
+)
+def load_dashboard_body(pathname):
+    """Fill in the dashboard body after the authenticated shell renders"""
+    return _DASHBOARD_BODY
 
 
 # ============================================================================
 # REGISTRATION FORM CALLBACKS
 # ============================================================================
 
-@app.callback(
+# The registration forms are static, so they are serialized once and switched
+# in the browser without a server round trip. Each form is kept as a JSON
+# string and parsed per switch so the renderer always gets a fresh tree.
+_REGISTER_FORMS = json.dumps({
+    'company': to_json_plotly(create_company_register_form()),
+    'employee': to_json_plotly(create_employee_register_form()),
+    'individual': to_json_plotly(create_individual_register_form())
+})
+
+# Update registration form based on selected account type
+app.clientside_callback(
+    """
+    (function() {
+        const forms = %s;
+        return function(account_type) {
+            return JSON.parse(forms[account_type] || forms.individual);
+        };
+    })()
+    """ % _REGISTER_FORMS,
     Output('register-form-container', 'children'),
     Input('register-account-type', 'value')
 )
-def update_register_form(account_type):
-    """Update registration form based on selected account type"""
-    if account_type == 'company':
-        return create_company_register_form()
-    elif account_type == 'employee':
-        return create_employee_register_form()
-    else:  # individual
-        return create_individual_register_form()
+
+
+# Worker threads for the session cleanup on logout, which runs in the background
+# so the redirect doesn't wait on the database write
+_auth_pool = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+
+
+# Validation warnings shared by the login and registration callbacks, serialized once
+_LOGIN_FIELDS_ALERT = _to_plain_json(dbc.Alert("Please enter both email and password", color="warning"))
+_REQUIRED_FIELDS_ALERT = _to_plain_json(dbc.Alert("Please fill in all required fields (*)", color="warning"))
+_TERMS_ALERT = _to_plain_json(dbc.Alert("You must agree to the Terms of Service", color="warning"))
+_PASSWORD_MISMATCH_ALERT = _to_plain_json(dbc.Alert("Passwords do not match", color="warning"))
+
+# Static parts of the login and registration result alerts
+_SUCCESS_ICON = _to_plain_json(html.I(className="fas fa-check-circle me-2"))
+_SUCCESS_LABEL = _to_plain_json(html.Strong("Success! "))
+_SIGN_IN_LINK = _to_plain_json(html.A("sign in", href="/", className="alert-link"))
+_FAIL_ICON = _to_plain_json(html.I(className="fas fa-exclamation-triangle me-2"))
+
+
+def _alert(children, color):
+    """
+    dbc.Alert as a plain component dict
+
+    The result alerts only swap the message text into prebuilt icons, so
+    they skip the dbc.Alert constructor the same way the card grid does (_col).
+    """
+    return {
+        'namespace': 'dash_bootstrap_components',
+        'type': 'Alert',
+        'props': {'children': children, 'color': color}
+    }
+
+
+def _success_alert(message, suffix="."):
+    """Registration success alert pointing the user to the sign in page"""
+    return _alert([
+        _SUCCESS_ICON,
+        _SUCCESS_LABEL,
+        f"{message} You can now ",
+        _SIGN_IN_LINK,
+        suffix
+    ], "success")
+
+
+def _fail_alert(message):
+    """Login or registration failure alert"""
+    return _alert([_FAIL_ICON, message], "danger")
 
 
 # ============================================================================
@@ -306,13 +515,17 @@ def update_register_form(account_type):
 )
 def handle_login(n_clicks, n_submit, email, password, current_session):
     """Handle login form submission"""
+    # prevent_initial_call doesn't cover this callback: the login form is
+    # inserted by display_page while session-store and url live outside it,
+    # and Dash fires callbacks of an inserted layout whose outputs are outside
+    # it. Without this guard every login page render shows the fields warning.
     if not n_clicks and not n_submit:
-        return dash.no_update, dash.no_update, dash.no_update
+        raise PreventUpdate
 
-    # Validate inputs
+    # Validate inputs (emails are stored normalized, see _strip_lower)
+    email = _norm(email, _strip_lower)
     if not email or not password:
-        alert = dbc.Alert("Please enter both email and password", color="warning")
-        return alert, dash.no_update, dash.no_update
+        return _LOGIN_FIELDS_ALERT, dash.no_update, dash.no_update
 
     # Authenticate user
     success, user_type, user_dict, message = auth_manager.authenticate(email, password)
@@ -327,18 +540,93 @@ def handle_login(n_clicks, n_submit, email, password, current_session):
             'user_type': user_type
         }
 
-        alert = dbc.Alert(
-            [html.I(className="fas fa-check-circle me-2"), message],
-            color="success"
-        )
-
-        return alert, session_data, '/'
+        return _alert([_SUCCESS_ICON, message], "success"), session_data, '/'
     else:
-        alert = dbc.Alert(
-            [html.I(className="fas fa-exclamation-triangle me-2"), message],
-            color="danger"
-        )
-        return alert, dash.no_update, dash.no_update
+        return _fail_alert(message), dash.no_update, dash.no_update
+
+
+def _strip_lower(value):
+    """Normalize an email address for storage and lookup"""
+    return value.strip().lower()
+
+
+# Registration form fields as (key, cleaner, required), in callback argument order
+_COMPANY_FIELDS = (
+    ('company_name', str.strip, True),
+    ('company_email', _strip_lower, True),
+    ('phone', str.strip, False),
+    ('address', str.strip, False),
+    ('admin_name', str.strip, True),
+    ('admin_email', _strip_lower, True),
+)
+_EMPLOYEE_FIELDS = (
+    ('company_id', int, True),
+    ('first_name', str.strip, True),
+    ('last_name', str.strip, True),
+    ('email', _strip_lower, True),
+    ('role', None, False),
+    ('department', str.strip, False),
+)
+_INDIVIDUAL_FIELDS = (
+    ('first_name', str.strip, True),
+    ('last_name', str.strip, True),
+    ('email', _strip_lower, True),
+    ('organization', str.strip, False),
+    ('phone', str.strip, False),
+)
+
+
+def _norm(value, clean=None):
+    """Clean a single form value, short-circuiting empty input to None"""
+    if not value:
+        return None
+    return (clean(value) if clean else value) or None
+
+
+def _clean_and_validate(fields, values):
+    """
+    Clean the fields of a registration form in one pass
+
+    Each value is normalized with its field's cleaner (see _norm). Returns None
+    as soon as a required field turns out to be empty.
+    """
+    cleaned = {}
+    for (key, clean, required), value in zip(fields, values):
+        value = _norm(value, clean)
+        if required and not value:
+            return None
+        cleaned[key] = value
+    return cleaned
+
+
+def _register(register, fields, values, password, password_confirm, terms, id_label=None):
+    """
+    Validate a registration form and create the account
+
+    Shared by the company, employee and individual callbacks. register is the
+    auth_manager method for the account type; when id_label is given the new
+    account's ID is shown in the success alert. Returns the alert to display.
+    """
+    # Clean and validate required fields
+    data = _clean_and_validate(fields, values)
+    if data is None or not password:
+        return _REQUIRED_FIELDS_ALERT
+
+    # Validate terms acceptance
+    if not terms:
+        return _TERMS_ALERT
+
+    # Validate password match
+    if password != password_confirm:
+        return _PASSWORD_MISMATCH_ALERT
+
+    success, account_id, message = register(data, password)
+
+    if not success:
+        return _fail_alert(message)
+    if id_label:
+        return _success_alert(message, f". Your {id_label} is: {account_id}")
+    return _success_alert(message)
 
 
 # ============================================================================
@@ -362,47 +650,16 @@ def handle_login(n_clicks, n_submit, email, password, current_session):
 def handle_company_registration(n_clicks, company_name, company_email, phone, address,
                                  admin_name, admin_email, password, password_confirm, terms):
     """Handle company registration"""
+    # Fired with n_clicks=None when the form switcher inserts the form, since
+    # register-alert is outside register-form-container (see handle_login)
     if not n_clicks:
-        return dash.no_update
+        raise PreventUpdate
 
-    # Validate required fields
-    if not all([company_name, company_email, admin_name, admin_email, password]):
-        return dbc.Alert("Please fill in all required fields (*)", color="warning")
-
-    # Validate terms acceptance
-    if not terms:
-        return dbc.Alert("You must agree to the Terms of Service", color="warning")
-
-    # Validate password match
-    if password != password_confirm:
-        return dbc.Alert("Passwords do not match", color="warning")
-
-    # Prepare company data
-    company_data = {
-        'company_name': company_name.strip(),
-        'company_email': company_email.strip().lower(),
-        'admin_name': admin_name.strip(),
-        'admin_email': admin_email.strip().lower(),
-        'phone': phone.strip() if phone else None,
-        'address': address.strip() if address else None
-    }
-
-    # Register company
-    success, company_id, message = auth_manager.register_company(company_data, password)
-
-    if success:
-        return dbc.Alert([
-            html.I(className="fas fa-check-circle me-2"),
-            html.Strong("Success! "),
-            f"{message} You can now ",
-            html.A("sign in", href="/", className="alert-link"),
-            f". Your Company ID is: {company_id}"
-        ], color="success")
-    else:
-        return dbc.Alert([
-            html.I(className="fas fa-exclamation-triangle me-2"),
-            message
-        ], color="danger")
+    return _register(
+        auth_manager.register_company,
+        _COMPANY_FIELDS, (company_name, company_email, phone, address, admin_name, admin_email),
+        password, password_confirm, terms, id_label="Company ID"
+    )
 
 
 # ============================================================================
@@ -426,47 +683,16 @@ def handle_company_registration(n_clicks, company_name, company_email, phone, ad
 def handle_employee_registration(n_clicks, company_id, first_name, last_name, email,
                                   role, department, password, password_confirm, terms):
     """Handle employee registration"""
+    # Fired with n_clicks=None when the form switcher inserts the form, since
+    # register-alert is outside register-form-container (see handle_login)
     if not n_clicks:
-        return dash.no_update
-
-    # Validate required fields
-    if not all([company_id, first_name, last_name, email, password]):
-        return dbc.Alert("Please fill in all required fields (*)", color="warning")
-
-    # Validate terms acceptance
-    if not terms:
-        return dbc.Alert("You must agree to the Terms of Service", color="warning")
+        raise PreventUpdate
 
-    # Validate password match
-    if password != password_confirm:
-        return dbc.Alert("Passwords do not match", color="warning")
-
-    # Prepare employee data
-    employee_data = {
-        'company_id': int(company_id),
-        'first_name': first_name.strip(),
-        'last_name': last_name.strip(),
-        'email': email.strip().lower(),
-        'role': role,
-        'department': department.strip() if department else None
-    }
-
-    # Register employee
-    success, employee_id, message = auth_manager.register_employee(employee_data, password)
-
-    if success:
-        return dbc.Alert([
-            html.I(className="fas fa-check-circle me-2"),
-            html.Strong("Success! "),
-            f"{message} You can now ",
-            html.A("sign in", href="/", className="alert-link"),
-            "."
-        ], color="success")
-    else:
-        return dbc.Alert([
-            html.I(className="fas fa-exclamation-triangle me-2"),
-            message
-        ], color="danger")
+    return _register(
+        auth_manager.register_employee,
+        _EMPLOYEE_FIELDS, (company_id, first_name, last_name, email, role, department),
+        password, password_confirm, terms
+    )
 
 
 # ============================================================================
@@ -489,52 +715,29 @@ def handle_employee_registration(n_clicks, company_id, first_name, last_name, em
 def handle_individual_registration(n_clicks, first_name, last_name, email,
                                     organization, phone, password, password_confirm, terms):
     """Handle individual registration"""
+    # Fired with n_clicks=None when the form switcher inserts the form, since
+    # register-alert is outside register-form-container (see handle_login)
     if not n_clicks:
-        return dash.no_update
+        raise PreventUpdate
 
-    # Validate required fields
-    if not all([first_name, last_name, email, password]):
-        return dbc.Alert("Please fill in all required fields (*)", color="warning")
-
-    # Validate terms acceptance
-    if not terms:
-        return dbc.Alert("You must agree to the Terms of Service", color="warning")
-
-    # Validate password match
-    if password != password_confirm:
-        return dbc.Alert("Passwords do not match", color="warning")
-
-    # Prepare individual data
-    individual_data = {
-        'first_name': first_name.strip(),
-        'last_name': last_name.strip(),
-        'email': email.strip().lower(),
-        'organization': organization.strip() if organization else None,
-        'phone': phone.strip() if phone else None
-    }
-
-    # Register individual
-    success, individual_id, message = auth_manager.register_individual(individual_data, password)
-
-    if success:
-        return dbc.Alert([
-            html.I(className="fas fa-check-circle me-2"),
-            html.Strong("Success! "),
-            f"{message} You can now ",
-            html.A("sign in", href="/", className="alert-link"),
-            "."
-        ], color="success")
-    else:
-        return dbc.Alert([
-            html.I(className="fas fa-exclamation-triangle me-2"),
-            message
-        ], color="danger")
+    return _register(
+        auth_manager.register_individual,
+        _INDIVIDUAL_FIELDS, (first_name, last_name, email, organization, phone),
+        password, password_confirm, terms
+    )
 
 
 # ============================================================================
 # LOGOUT CALLBACK
 # ============================================================================
 
+def _log_session_cleanup_error(future):
+    """Log a failed background session deletion"""
+    error = future.exception()
+    if error is not None:
+        logger.error("Error deleting session on logout: %s", error)
+
+
 @app.callback(
     [Output('session-store', 'data', allow_duplicate=True),
      Output('url', 'pathname', allow_duplicate=True)],
@@ -544,11 +747,19 @@ def handle_individual_registration(n_clicks, first_name, last_name, email,
 )
 def handle_logout(n_clicks, session_data):
     """Handle logout"""
+    # The logout button arrives with the authenticated layout, but this
+    # callback's outputs (session-store, url) are outside it, so Dash calls it
+    # on every authenticated render despite prevent_initial_call. Without the
+    # guard each login would be followed by an immediate logout.
     if not n_clicks:
-        return dash.no_update, dash.no_update
+        raise PreventUpdate
 
     if session_data and session_data.get('session_id'):
-        auth_manager.delete_session(session_data['session_id'])
+        # Drop the cached user right away; the database row is deleted in the
+        # background so the redirect doesn't wait on the write
+        _session_user_cache.delete(session_data['session_id'])
+        _auth_pool.submit(auth_manager.delete_session, session_data['session_id']) \
+            .add_done_callback(_log_session_cleanup_error)
 
     return {}, '/'
 
@@ -557,7 +768,35 @@ def handle_logout(n_clicks, session_data):
 # NAVIGATION CALLBACKS
 # ============================================================================
 
-@app.callback(
+# Navigation and sort-mode changes are pure UI state, so they run in the
+# browser as clientside callbacks instead of a server round trip per click
+
+# Page each login/register link navigates to
+_NAV_TARGETS = {
+    'show-register-link': '/register',
+    'show-login-link': '/',
+    'show-login-link-employee': '/',
+    'show-login-link-individual': '/'
+}
+
+# Handle navigation between login and register pages. The lookup table is
+# built once when the browser loads the callback, not on every click.
+app.clientside_callback(
+    """
+    (function() {
+        const navTargets = %s;
+        return function(register_clicks, login_clicks, login_employee_clicks, login_individual_clicks) {
+            const triggered = dash_clientside.callback_context.triggered;
+            const target = triggered && triggered.length
+                ? navTargets[triggered[0].prop_id.split('.')[0]]
+                : undefined;
+            if (target === undefined) {
+                throw dash_clientside.PreventUpdate;
+            }
+            return target;
+        };
+    })()
+    """ % json.dumps(_NAV_TARGETS),
     Output('url', 'pathname', allow_duplicate=True),
     [Input('show-register-link', 'n_clicks'),
      Input('show-login-link', 'n_clicks'),
@@ -565,46 +804,67 @@ def handle_logout(n_clicks, session_data):
      Input('show-login-link-individual', 'n_clicks')],
     prevent_initial_call=True
 )
-def navigate(register_clicks, login_clicks, login_employee_clicks, login_individual_clicks):
-    """Handle navigation between login and register pages"""
-    ctx = callback_context
-
-    logger.info(f"[NAVIGATION] Callback triggered! ctx.triggered: {ctx.triggered}")
-    logger.info(f"[NAVIGATION] Clicks - register: {register_clicks}, login: {login_clicks}, employee: {login_employee_clicks}, individual: {login_individual_clicks}")
-
-    # More robust check for triggered component
-    if not ctx.triggered or not ctx.triggered[0]:
-        logger.info("[NAVIGATION] No trigger detected, returning no_update")
-        return dash.no_update
-
-    # Get the ID of the component that triggered the callback
-    triggered_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    logger.info(f"[NAVIGATION] Triggered ID: {triggered_id}")
-
-    # Route based on which link was clicked
-    if triggered_id == 'show-register-link':
-        logger.info("[NAVIGATION] Navigating to /register")
-        return '/register'
-    elif triggered_id in ['show-login-link', 'show-login-link-employee', 'show-login-link-individual']:
-        logger.info("[NAVIGATION] Navigating to /")
-        return '/'
-
-    logger.info("[NAVIGATION] No match, returning no_update")
-    return dash.no_update
 
 
 # ============================================================================
 # DASHBOARD INTEGRATION CALLBACKS
 # ============================================================================
 
-@app.callback(
+# Close welcome modal
+app.clientside_callback(
+    """
+    function(n_clicks) {
+        return false;
+    }
+    """,
     Output('welcome-modal', 'is_open'),
     Input('close-welcome-modal', 'n_clicks'),
     prevent_initial_call=True
 )
-def close_welcome(n_clicks):
-    """Close welcome modal"""
-    return False
+
+
+# Store the selected sort mode ('importance', 'performance' or 'trend').
+# Repeated clicks on the current mode leave the store untouched, so a burst of
+# clicks triggers at most one load_all_kpis round trip per mode change.
+app.clientside_callback(
+    """
+    function(importance_clicks, performance_clicks, trend_clicks, current_mode) {
+        const triggered = dash_clientside.callback_context.triggered;
+        if (!triggered || !triggered.length) {
+            throw dash_clientside.PreventUpdate;
+        }
+        const mode = triggered[0].prop_id.split('.')[0].replace('auth-sort-', '');
+        if (mode === current_mode) {
+            throw dash_clientside.PreventUpdate;
+        }
+        return mode;
+    }
+    """,
+    Output('auth-sort-mode', 'data'),
+    [Input('auth-sort-importance', 'n_clicks'),
+     Input('auth-sort-performance', 'n_clicks'),
+     Input('auth-sort-trend', 'n_clicks')],
+    State('auth-sort-mode', 'data'),
+    prevent_initial_call=True
+)
+
+
+# Hospital dropdown options, loaded on first use and shared by every page render.
+# Empty results (e.g. a failed load) are not kept, so the next render retries.
+_hospital_options = ()
+
+
+def get_auth_hospital_options():
+    """Hospital dropdown options as an immutable tuple, loaded once per process"""
+    global _hospital_options
+    if not _hospital_options:
+        hospitals = data_manager.get_available_hospitals()
+
+        _hospital_options = tuple(
+            {'label': f"CCN {provider_number} - {state_code}", 'value': provider_number}
+            for provider_number, state_code in zip(hospitals['Provider_Number'], hospitals['State_Code'])
+        )
+    return _hospital_options
 
 
 @app.callback(
@@ -615,164 +875,324 @@ def load_hospital_list(pathname):
     """Load hospital dropdown options"""
     if pathname == '/' or pathname == '/dashboard':
         try:
-            from dashboard import data_manager
-            hospitals = data_manager.get_available_hospitals()
-
-            options = [
-                {'label': f"CCN {row['Provider_Number']} - {row['State_Code']}", 'value': row['Provider_Number']}
-                for _, row in hospitals.iterrows()
-            ]
-            return options
+            return get_auth_hospital_options()
         except Exception as e:
-            logger.error(f"Error loading hospitals: {e}")
+            logger.error("Error loading hospitals: %s", e)
             return []
     return []
 
 
+# Rankings only depend on the hospital and benchmark level, so sort-button
+# clicks reuse them instead of recomputing KPIs, benchmarks and scores
+kpi_rankings_cache = QueryCache(max_size=200, ttl=600)
+
+# Built KPI cards by (ccn, benchmark_level, kpi_key, rank); the rank is part of
+# the key because it is shown on the card. Same TTL as the rankings they render.
+kpi_card_cache = QueryCache(max_size=4096, ttl=600)
+
+
+@lru_cache(maxsize=8)
+def _kpi_columns(columns):
+    """
+    KPI keys present in a KPI table with the given columns, in KPI_METADATA order
+
+    Every hospital's KPI table has the same columns, so this is computed once
+    per schema. Returns (kpi_keys, higher_is_better) with a read-only boolean
+    array aligned with kpi_keys.
+    """
+    available_columns = frozenset(columns)
+    kpi_keys = tuple(kpi_key for kpi_key in KPI_METADATA if kpi_key in available_columns)
+    higher_is_better = np.array(
+        [KPI_METADATA[kpi_key].get('higher_is_better', True) for kpi_key in kpi_keys], dtype=bool
+    )
+    higher_is_better.setflags(write=False)
+    return kpi_keys, higher_is_better
+
+
+@cached_query(cache=kpi_rankings_cache)
+def _compute_kpi_rankings(ccn, benchmark_level):
+    """
+    Compute KPI values, benchmarks and ranking scores for a hospital
+
+    Returns:
+        Dict with the hospital type, benchmark data, KPI values (rows are
+        fiscal years, columns are kpi_keys), the dynamic priorities and the
+        ranked column order for each sort mode, or None if the hospital has
+        no KPI data
+    """
+    # Get hospital metadata
+    hospital_type = data_manager.classify_hospital_type(ccn)
+
+    # Get KPI data
+    kpi_data = data_manager.calculate_kpis(ccn)
+
+    if kpi_data.empty:
+        return None
+
+    fiscal_years = kpi_data['Fiscal_Year'].to_numpy()
+    latest_year = int(fiscal_years.max())
+
+    # Get benchmarks
+    logger.debug("[AUTH-DASHBOARD] Calculating benchmarks for %s at %s level...", ccn, benchmark_level)
+    benchmark_data = data_manager.get_benchmarks(ccn, latest_year, benchmark_level)
+    logger.debug("[AUTH-DASHBOARD] Benchmarks calculated: %s peers", benchmark_data.get('provider_count', 0))
+
+    # Score every KPI at once on arrays (rows are fiscal years, columns are KPIs)
+    kpi_keys, higher_is_better = _kpi_columns(tuple(kpi_data.columns))
+    kpi_values = kpi_data[list(kpi_keys)].to_numpy(dtype=float)
+    latest_values = kpi_values[0]
+
+    benchmark_medians = {
+        kpi_key: kpi_benchmark.get('Median')
+        for kpi_key, kpi_benchmark in benchmark_data.get('kpis', {}).items()
+    }
+    medians = np.array([benchmark_medians.get(kpi_key) for kpi_key in kpi_keys], dtype=float)
+
+    dynamic_priority = calculate_dynamic_priorities(kpi_keys, latest_values, medians, higher_is_better)
+
+    # Performance gap is only meaningful when both the value and the median are non-zero
+    has_gap = ~np.isnan(latest_values) & ~np.isnan(medians) & (latest_values != 0) & (medians != 0)
+    perf_gap = np.where(has_gap, np.abs(medians - latest_values), 0.0)
+
+    trend_pct = np.abs(calculate_trend_pcts(kpi_values))
+
+    # Rank once per sort mode here, so a sort click only picks a cached order
+    ranked_orders = {
+        sort_mode: np.argsort(-sort_scores, kind='stable')
+        for sort_mode, sort_scores in (
+            ('importance', dynamic_priority),
+            ('performance', perf_gap),
+            ('trend', trend_pct)
+        )
+    }
+
+    return {
+        'hospital_type': hospital_type,
+        'benchmark_data': benchmark_data,
+        'fiscal_years': fiscal_years,
+        'kpi_keys': kpi_keys,
+        'kpi_values': kpi_values,
+        'dynamic_priority': dynamic_priority,
+        'ranked_orders': ranked_orders
+    }
+
+
 @app.callback(
     [Output('auth-hospital-name', 'children'),
      Output('auth-hospital-type', 'children'),
      Output('auth-benchmark-group', 'children'),
-     Output('auth-peer-count', 'children'),
-     Output('auth-kpi-cards-container', 'children')],
+     Output('auth-peer-count', 'children')],
     [Input('auth-hospital-dropdown', 'value'),
-     Input('auth-benchmark-dropdown', 'value'),
-     Input('auth-sort-importance', 'n_clicks'),
-     Input('auth-sort-performance', 'n_clicks'),
-     Input('auth-sort-trend', 'n_clicks')],
+     Input('auth-benchmark-dropdown', 'value')],
     prevent_initial_call=True
 )
-def load_all_kpis(ccn, benchmark_level, sort_imp, sort_perf, sort_trend):
-    """Load all KPIs for selected hospital with sorting"""
+def update_hospital_summary(ccn, benchmark_level):
+    """Update the summary stats for the selected hospital and benchmark level"""
     if not ccn:
-        return "Select a hospital", "N/A", "N/A", "N/A", dbc.Alert([
-            html.I(className="fas fa-info-circle me-2"),
-            "Select a hospital above to view KPI analysis"
-        ], color="info")
+        return "Select a hospital", "N/A", "N/A", "N/A"
 
     try:
-        # Import all necessary components from dashboard
-        from dashboard import (
-            data_manager,
-            create_kpi_card,
-            calculate_dynamic_priority,
-            calculate_trend,
-            calculate_percentile_rank,
-            create_sparkline
-        )
-        from kpi_hierarchy_config import KPI_METADATA
-        import pandas as pd
-
-        # Get hospital metadata
-        hospital_type = data_manager.classify_hospital_type(ccn)
-        state_code = str(ccn)[:2]
-
-        # Get KPI data
-        kpi_data = data_manager.calculate_kpis(ccn)
-
-        if kpi_data.empty:
-            return f"CCN {ccn}", "N/A", "N/A", "N/A", dbc.Alert("No data available for this hospital", color="warning")
-
-        latest_year = kpi_data['Fiscal_Year'].max()
-
-        # Get benchmarks
-        logger.info(f"[AUTH-DASHBOARD] Calculating benchmarks for {ccn} at {benchmark_level} level...")
-        benchmark_data = data_manager.get_benchmarks(ccn, latest_year, benchmark_level)
-        logger.info(f"[AUTH-DASHBOARD] Benchmarks calculated: {benchmark_data.get('provider_count', 0)} peers")
-
-        # Rank KPIs by priority
-        kpi_rankings = []
-        for kpi_key in KPI_METADATA.keys():
-            if kpi_key not in kpi_data.columns:
-                continue
-
-            kpi_meta = KPI_METADATA.get(kpi_key, {})
-            higher_is_better = kpi_meta.get('higher_is_better', True)
-
-            kpi_values = kpi_data[kpi_key].values
-            kpi_value = kpi_values[0] if len(kpi_values) > 0 else None
-
-            benchmark_kpis = benchmark_data.get('kpis', {})
-            kpi_benchmark = benchmark_kpis.get(kpi_key, {})
-            median = kpi_benchmark.get('Median')
-
-            dynamic_priority = calculate_dynamic_priority(kpi_key, kpi_value, median, higher_is_better)
-
-            # Calculate performance gap
-            if kpi_value and median:
-                if higher_is_better:
-                    perf_gap = median - kpi_value
-                else:
-                    perf_gap = kpi_value - median
-            else:
-                perf_gap = 0
-
-            # Calculate trend
-            trend_direction, trend_pct = calculate_trend(kpi_values)
-
-            kpi_rankings.append({
-                'kpi_key': kpi_key,
-                'dynamic_priority': dynamic_priority,
-                'perf_gap': abs(perf_gap),
-                'trend_pct': abs(trend_pct),
-                'kpi_value': kpi_value,
-                'kpi_values': kpi_values
-            })
-
-        # Determine sort order
-        ctx = dash.callback_context
-        if ctx.triggered:
-            button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-            if button_id == 'auth-sort-performance':
-                kpi_rankings.sort(key=lambda x: x['perf_gap'], reverse=True)
-            elif button_id == 'auth-sort-trend':
-                kpi_rankings.sort(key=lambda x: x['trend_pct'], reverse=True)
-            else:
-                kpi_rankings.sort(key=lambda x: x['dynamic_priority'], reverse=True)
-        else:
-            kpi_rankings.sort(key=lambda x: x['dynamic_priority'], reverse=True)
-
-        # Create all cards
-        kpi_cards = []
-        for idx, ranking in enumerate(kpi_rankings):
-            card = create_kpi_card(
-                kpi_key=ranking['kpi_key'],
-                kpi_value=ranking['kpi_value'],
-                kpi_trend_values=ranking['kpi_values'],
-                fiscal_years=kpi_data['Fiscal_Year'].values,
-                benchmark_data=benchmark_data,
-                rank=idx + 1,
-                importance_score=ranking['dynamic_priority']
-            )
-            kpi_cards.append(dbc.Col(card, width=12, lg=6, xl=4))
-
-        cards_grid = dbc.Row(kpi_cards)
+        rankings = _compute_kpi_rankings(ccn, benchmark_level)
+
+        if rankings is None:
+            return f"CCN {ccn}", "N/A", "N/A", "N/A"
 
+        benchmark_data = rankings['benchmark_data']
         return (
             f"CCN {ccn}",
-            hospital_type,
+            rankings['hospital_type'],
             benchmark_data.get('group_name', 'N/A'),
-            f"{benchmark_data.get('provider_count', 0):,}",
-            cards_grid
+            f"{benchmark_data.get('provider_count', 0):,}"
         )
 
     except Exception as e:
-        logger.error(f"Error loading KPIs: {e}")
-        import traceback
-        traceback.print_exc()
-        return f"CCN {ccn}", "Error", "Error", "0", dbc.Alert(f"Error loading KPI data: {str(e)}", color="danger")
+        logger.error("Error loading hospital summary: %s", e)
+        return f"CCN {ccn}", "Error", "Error", "0"
+
+
+# Worker threads shared by all callbacks for building KPI cards
+_card_pool = ThreadPoolExecutor(max_workers=4)
+
+# Number of KPI cards sent with the first response; the rest follow in a
+# second callback so the top-ranked cards paint without waiting for all of them
+INITIAL_KPI_CARDS = 6
+
+
+def _col(child, **widths):
+    """
+    dbc.Col as a plain component dict
+
+    Dash renders component dicts directly, so the card grid skips a
+    dbc.Col constructor (and its prop validation) for every card.
+    """
+    return {
+        'namespace': 'dash_bootstrap_components',
+        'type': 'Col',
+        'props': {'children': child, **widths}
+    }
+
+
+def build_kpi_cards(rankings, ccn, benchmark_level, sort_mode, start=0, stop=None):
+    """
+    Build the ranked KPI card columns in positions [start, stop) for a sort mode
+
+    Cards already built for this hospital, benchmark level and rank are
+    reused from kpi_card_cache.
+    """
+    kpi_keys = rankings['kpi_keys']
+    kpi_values = rankings['kpi_values']
+    dynamic_priority = rankings['dynamic_priority']
+
+    # Arguments shared by every card
+    make_card = partial(
+        create_kpi_card,
+        fiscal_years=rankings['fiscal_years'],
+        benchmark_data=rankings['benchmark_data']
+    )
+
+    # Sort order (unknown modes fall back to the dynamic priority)
+    ranked_orders = rankings['ranked_orders']
+    ranked = ranked_orders.get(sort_mode, ranked_orders['importance'])
+
+    # Build the cards missing from the cache on the shared pool; sparkline
+    # figure construction can overlap across threads
+    cards = {}
+    pending_cards = {}
+    for rank, idx in enumerate(ranked[start:stop], start=start + 1):
+        kpi_key = kpi_keys[idx]
+        card = kpi_card_cache.get(ccn, benchmark_level, kpi_key, rank)
+        if card is not None:
+            cards[rank] = card
+            continue
+
+        pending_cards[rank] = (kpi_key, _card_pool.submit(
+            make_card,
+            kpi_key=kpi_key,
+            kpi_value=kpi_values[0, idx],
+            kpi_trend_values=kpi_values[:, idx],
+            rank=rank,
+            importance_score=dynamic_priority[idx]
+        ))
+
+    for rank, (kpi_key, future) in pending_cards.items():
+        cards[rank] = future.result()
+        kpi_card_cache.set(cards[rank], ccn, benchmark_level, kpi_key, rank)
+
+    return [_col(cards[rank], width=12, lg=6, xl=4) for rank in sorted(cards)]
+
+
+@app.callback(
+    [Output('auth-kpi-cards-container', 'children'),
+     Output('auth-pending-kpis', 'data')],
+    [Input('auth-hospital-dropdown', 'value'),
+     Input('auth-benchmark-dropdown', 'value'),
+     Input('auth-sort-mode', 'data')],
+    prevent_initial_call=True
+)
+def load_all_kpis(ccn, benchmark_level, sort_mode):
+    """Load the top-ranked KPI cards for selected hospital with sorting"""
+    if not ccn:
+        return _SELECT_HOSPITAL_ALERT, None
+
+    try:
+        rankings = _compute_kpi_rankings(ccn, benchmark_level)
+
+        if rankings is None:
+            return dbc.Alert("No data available for this hospital", color="warning"), None
+
+        kpi_cards = build_kpi_cards(rankings, ccn, benchmark_level, sort_mode, stop=INITIAL_KPI_CARDS)
+
+        # Remaining cards are appended by load_remaining_kpis
+        pending = None
+        if len(rankings['kpi_keys']) > INITIAL_KPI_CARDS:
+            pending = {'ccn': ccn, 'benchmark_level': benchmark_level, 'sort_mode': sort_mode}
+
+        return dbc.Row(kpi_cards, id='auth-kpi-cards-grid'), pending
+
+    except Exception as e:
+        logger.exception("Error loading KPIs for CCN=%s level=%s", ccn, benchmark_level)
+        return dbc.Alert(f"Error loading KPI data: {str(e)}", color="danger"), None
+
+
+@app.callback(
+    Output('auth-kpi-cards-grid', 'children'),
+    Input('auth-pending-kpis', 'data'),
+    [State('auth-hospital-dropdown', 'value'),
+     State('auth-benchmark-dropdown', 'value'),
+     State('auth-sort-mode', 'data')],
+    prevent_initial_call=True
+)
+def load_remaining_kpis(pending, ccn, benchmark_level, sort_mode):
+    """Append the KPI cards after the first INITIAL_KPI_CARDS to the grid"""
+    # Skip if there is nothing left or the selection changed since the first batch
+    if not pending or pending != {'ccn': ccn, 'benchmark_level': benchmark_level, 'sort_mode': sort_mode}:
+        raise PreventUpdate
+
+    try:
+        rankings = _compute_kpi_rankings(ccn, benchmark_level)
+        remaining_cards = []
+        if rankings is not None:
+            remaining_cards = build_kpi_cards(rankings, ccn, benchmark_level, sort_mode, start=INITIAL_KPI_CARDS)
+    except Exception as e:
+        logger.error("Error loading remaining KPIs: %s", e)
+        raise PreventUpdate
+
+    if not remaining_cards:
+        raise PreventUpdate
+
+    grid = Patch()
+    grid.extend(remaining_cards)
+    return grid
 
 
 # ============================================================================
-# RUN SERVER
+# SESSION CLEANUP
 # ============================================================================
 
-if __name__ == '__main__':
-    # Cleanup expired sessions on startup
-    cleaned = auth_manager.cleanup_expired_sessions()
-    if cleaned > 0:
-        logger.info(f"Cleaned up {cleaned} expired sessions")
+# Seconds between sweeps of expired sessions, so the sessions table stays small
+# for the lookups on every authenticated request
+SESSION_CLEANUP_INTERVAL = 15 * 60
 
+
+_session_cleanup_started = False
+_session_cleanup_lock = threading.Lock()
+
+
+def _schedule_session_cleanup(delay):
+    """Run cleanup_expired_sessions_periodically after delay seconds on a daemon timer"""
+    timer = threading.Timer(delay, cleanup_expired_sessions_periodically)
+    timer.daemon = True
+    timer.start()
+
+
+def cleanup_expired_sessions_periodically():
+    """Remove expired sessions now and schedule the next cleanup"""
+    try:
+        cleaned = auth_manager.cleanup_expired_sessions()
+        if cleaned > 0:
+            logger.info("Cleaned up %d expired sessions", cleaned)
+    except Exception as e:
+        logger.error("Error cleaning up expired sessions: %s", e)
+    finally:
+        _schedule_session_cleanup(SESSION_CLEANUP_INTERVAL)
+
+
+def start_session_cleanup():
+    """Start the periodic session cleanup, at most once per process"""
+    global _session_cleanup_started
+    with _session_cleanup_lock:
+        if _session_cleanup_started:
+            return
+        _session_cleanup_started = True
+    _schedule_session_cleanup(0)
+
+
+# Started at import rather than under __main__, so the cleanup also runs when
+# the app is served through app.py or a WSGI server
+start_session_cleanup()
+
+
+if __name__ == '__main__':
     logger.info("\n" + "="*70)
     logger.info("Hospital KPI Dashboard with Authentication")
     logger.info("="*70)
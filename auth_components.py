@@ -4,10 +4,16 @@ Authentication UI Components for Dash
 Provides user-friendly login and registration interfaces
 """
 
+from functools import lru_cache
+
 import dash_bootstrap_components as dbc
 from dash import html, dcc
 
+# The page and form factories take no arguments and build static trees, so each
+# is cached after its first call. Dash only serializes the returned components.
+
 
+@lru_cache(maxsize=None)
 def create_login_layout():
     """Create the login page layout"""
     return dbc.Container([
@@ -126,6 +132,7 @@ def create_login_layout():
     ], fluid=True, style={'minHeight': '100vh', 'backgroundColor': '#f8f9fa', 'paddingTop': '60px'})
 
 
+@lru_cache(maxsize=None)
 def create_register_layout():
     """Create the registration page layout"""
     return dbc.Container([
@@ -206,6 +213,7 @@ def create_register_layout():
     ], fluid=True, style={'minHeight': '100vh', 'backgroundColor': '#f8f9fa', 'paddingTop': '60px'})
 
 
+@lru_cache(maxsize=None)
 def create_company_register_form():
     """Create company registration form"""
     return dbc.Card([
@@ -305,6 +313,7 @@ def create_company_register_form():
     ], className="shadow-sm", style={'borderRadius': '12px'})
 
 
+@lru_cache(maxsize=None)
 def create_employee_register_form():
     """Create employee registration form"""
     return dbc.Card([
@@ -409,6 +418,7 @@ def create_employee_register_form():
     ], className="shadow-sm", style={'borderRadius': '12px'})
 
 
+@lru_cache(maxsize=None)
 def create_individual_register_form():
     """Create individual registration form"""
     return dbc.Card([
@@ -394,14 +394,18 @@ class AuthManager:
         conn.close()
 
     def cleanup_expired_sessions(self):
-        """Remove all expired sessions"""
+        """Remove all expired sessions in a single DELETE"""
         conn = self.db.get_connection()
         cursor = conn.cursor()
 
+        # expires_at is stored as local time in ISO format (see create_session),
+        # so compare against datetime.now() like validate_session rather than
+        # SQLite's UTC CURRENT_TIMESTAMP. The cutoff is bound as the same ISO
+        # string instead of relying on sqlite3's deprecated datetime adapter.
         cursor.execute("""
             DELETE FROM sessions
-            WHERE expires_at < CURRENT_TIMESTAMP
-        """)
+            WHERE expires_at < ?
+        """, (datetime.now().isoformat(sep=' '),))
 
         deleted = cursor.rowcount
         conn.commit()
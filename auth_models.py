@@ -18,6 +18,8 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 class AuthDatabase:
     """Manages the authentication database"""
@@ -121,6 +123,8 @@ class AuthDatabase:
                 last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # Lets the periodic expired-session cleanup find rows without a table scan
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)")
 
         # Audit log for security
         cursor.execute("""
@@ -143,8 +147,7 @@ class AuthDatabase:
 
     def validate_email(self, email):
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return EMAIL_PATTERN.match(email) is not None
 
     def email_exists(self, email):
         """Check if email already exists in any user table"""
@@ -7,8 +7,11 @@ from dash import Input, Output, html, dash_table
 import dash_bootstrap_components as dbc
 import pandas as pd
 from utils.kpi_helpers import get_professional_datatable_style
+from utils.logging_config import get_logger
 from config.paths import COSTS_A000_OUTPUT, COSTS_B100_OUTPUT
 
+logger = get_logger(__name__)
+
 
 def register_callbacks(app, data_manager):
     """Register all cost worksheets callbacks"""
@@ -53,8 +56,7 @@ def register_callbacks(app, data_manager):
             return options, default_value
         except Exception as e:
             # Log error but return empty to avoid crashing the UI
-            import logging
-            logging.getLogger(__name__).debug(f"Error loading years for detailed costs: {e}")
+            logger.debug("Error loading years for detailed costs: %s", e)
             return [], None
 
     # Load detailed costs (Worksheet A)
@@ -159,8 +161,7 @@ def register_callbacks(app, data_manager):
                 table
             ])
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading detailed costs for CCN=%s year=%s", ccn, selected_year)
             return html.Div(f"Error loading detailed costs: {str(e)}", className="alert alert-danger")
 
     # Populate year dropdown for Worksheet B
@@ -203,8 +204,7 @@ def register_callbacks(app, data_manager):
             return options, default_value
         except Exception as e:
             # Log error but return empty to avoid crashing the UI
-            import logging
-            logging.getLogger(__name__).debug(f"Error loading years for worksheet B: {e}")
+            logger.debug("Error loading years for worksheet B: %s", e)
             return [], None
 
     # Load Worksheet B (Overhead Costs)
@@ -339,6 +339,5 @@ def register_callbacks(app, data_manager):
                 table
             ])
         except Exception as e:
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading worksheet B for CCN=%s year=%s", ccn, selected_year)
             return html.Div(f"Error loading worksheet B: {str(e)}", className="alert alert-danger")
@@ -5,23 +5,44 @@ Dashboard Callbacks - Main dashboard, routing, and UI interactions
 import dash
 from dash import Input, Output, State, html, ALL, MATCH, dash_table
 import dash_bootstrap_components as dbc
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import logging
 import pandas as pd
-import json
+import numpy as np
 
 from utils.logging_config import get_logger
 
 from config.mappings import DB_COLUMN_TO_KPI_KEY
 from config.card_registry import CARD_REGISTRY as KPI_METADATA
-from utils.kpi_helpers import (
-    calculate_importance_score,
-    calculate_dynamic_priority,
-    calculate_trend
-)
+from utils.kpi_helpers import calculate_dynamic_priorities, calculate_trend_pcts
 from components.kpi_cards import create_enhanced_level1_kpi_card
 from pages.layouts import get_main_dashboard_layout, get_level2_page_layout
 
 logger = get_logger(__name__)
 
+# The 6 Level 1 KPIs from to_do.txt - ONLY show these. A tuple keeps the card
+# order stable for ties (set iteration order changes between processes).
+LEVEL_1_KPIS = (
+    'Net_Income_Margin',                      # L1 KPI 1: Net Income Margin
+    'AR_Days',                                # L1 KPI 2: Days in Net Patient AR
+    'Operating_Expense_per_Adjusted_Discharge',  # L1 KPI 3: Operating Expense per Adjusted Discharge
+    'Medicare_CCR',                           # L1 KPI 4: Medicare Cost-to-Charge Ratio
+    'Bad_Debt_Charity_Pct',                   # L1 KPI 5: Bad Debt + Charity %
+    'Current_Ratio'                           # L1 KPI 6: Current Ratio
+)
+
+# Level 1 KPIs that have metadata, with their higher_is_better flags; these
+# only depend on the card registry, so they are resolved once at import
+LEVEL_1_KPI_KEYS = tuple(kpi_key for kpi_key in LEVEL_1_KPIS if kpi_key in KPI_METADATA)
+LEVEL_1_HIGHER_IS_BETTER = np.array(
+    [KPI_METADATA[kpi_key].get('higher_is_better', True) for kpi_key in LEVEL_1_KPI_KEYS], dtype=bool
+)
+LEVEL_1_HIGHER_IS_BETTER.setflags(write=False)
+
+# Worker threads shared by all dashboard updates for building the Level 1 cards
+_card_pool = ThreadPoolExecutor(max_workers=4)
+
 
 def register_callbacks(app, data_manager, hospital_options):
     """Register all dashboard-related callbacks"""
@@ -64,47 +85,50 @@ def register_callbacks(app, data_manager, hospital_options):
         state_code = ccn_str[:2]
 
         # DEBUG: Log data source status
-        logger.debug(f"\n[DEBUG] Data Manager Status:")
-        logger.info(f"  - Using database: {data_manager.use_database}")
-        logger.info(f"  - Using precomputed KPIs: {data_manager.use_precomputed}")
-        logger.info(f"  - Using worksheets: {data_manager.use_worksheets}")
-        logger.info(f"  - Worksheet tables available: {len(data_manager.worksheet_tables) if data_manager.worksheet_tables else 0}")
+        logger.debug(
+            "[DEBUG] Data Manager Status: database=%s, precomputed KPIs=%s, worksheets=%s (%d tables)",
+            data_manager.use_database, data_manager.use_precomputed, data_manager.use_worksheets,
+            len(data_manager.worksheet_tables or ())
+        )
 
         # Get KPI data
         kpi_data = data_manager.calculate_kpis(ccn)
 
-        logger.debug(f"\n[DEBUG] KPI Data for CCN {ccn}:")
-        logger.info(f"  - DataFrame shape: {kpi_data.shape}")
-        logger.info(f"  - Columns: {list(kpi_data.columns)}")
-        if not kpi_data.empty:
-            logger.info(f"  - Fiscal years: {sorted(kpi_data['Fiscal_Year'].unique())}")
-            logger.info(f"  - Sample data (first row): {kpi_data.iloc[0].to_dict() if len(kpi_data) > 0 else 'No rows'}")
+        # The fiscal year and first-row dumps are only built when DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DEBUG] KPI Data for CCN %s: shape %s, columns %s", ccn, kpi_data.shape, list(kpi_data.columns))
+            if not kpi_data.empty:
+                logger.debug("  - Fiscal years: %s", sorted(kpi_data['Fiscal_Year'].unique()))
+                logger.debug("  - Sample data (first row): %s", kpi_data.iloc[0].to_dict())
 
         if kpi_data.empty:
             logger.debug("[DEBUG] No KPI data available - returning early")
             return "N/A", "N/A", "N/A", "N/A", html.Div("No data available"), ccn
 
-        latest_year = kpi_data['Fiscal_Year'].max()
+        fiscal_years = kpi_data['Fiscal_Year'].to_numpy()
+        latest_year = int(fiscal_years.max())
 
-        # Calculate Level 2 KPIs
-        logger.info(f"Calculating Level 2 KPIs for {ccn}, year {latest_year}...")
+        # Calculate Level 2 KPIs (the summary counts are only built when INFO is enabled)
+        logger.info("Calculating Level 2 KPIs for %s, year %s...", ccn, latest_year)
         l2_kpis = data_manager.calculate_level2_kpis(ccn, latest_year)
-        if l2_kpis:
-            logger.info(f"Level 2 KPIs calculated: {sum(1 for v in l2_kpis.values() if v is not None)}/{len(l2_kpis)} KPIs")
-        else:
-            logger.info("Level 2 KPIs not available (worksheet database not connected)")
+        if logger.isEnabledFor(logging.INFO):
+            if l2_kpis:
+                logger.info("Level 2 KPIs calculated: %d/%d KPIs", sum(v is not None for v in l2_kpis.values()), len(l2_kpis))
+            else:
+                logger.info("Level 2 KPIs not available (worksheet database not connected)")
 
         # Calculate Level 3 KPIs
-        logger.info(f"Calculating Level 3 KPIs for {ccn}, year {latest_year}...")
+        logger.info("Calculating Level 3 KPIs for %s, year %s...", ccn, latest_year)
         l3_kpis = data_manager.calculate_level3_kpis(ccn, latest_year)
-        if l3_kpis:
-            logger.info(f"Level 3 KPIs calculated: {sum(1 for v in l3_kpis.values() if v is not None)}/{len(l3_kpis)} KPIs")
-        else:
-            logger.info("Level 3 KPIs not available (worksheet database not connected)")
+        if logger.isEnabledFor(logging.INFO):
+            if l3_kpis:
+                logger.info("Level 3 KPIs calculated: %d/%d KPIs", sum(v is not None for v in l3_kpis.values()), len(l3_kpis))
+            else:
+                logger.info("Level 3 KPIs not available (worksheet database not connected)")
 
         # Calculate ALL 4 benchmark levels (for new enhanced card design)
         # Order: State & Type (most specific), State, Hospital Type, National (broadest)
-        logger.info(f"Calculating benchmarks for {ccn} at all levels...")
+        logger.info("Calculating benchmarks for %s at all levels...", ccn)
         all_benchmarks = {
             'state_hospital_type': data_manager.get_benchmarks(ccn, latest_year, 'State_Hospital_Type'),
             'state': data_manager.get_benchmarks(ccn, latest_year, 'State'),
@@ -113,21 +137,11 @@ def register_callbacks(app, data_manager, hospital_options):
         }
         # Use state & type (most specific) as primary benchmark for display purposes (shown in header)
         benchmark_data = all_benchmarks['state_hospital_type']
-        logger.info(f"Benchmarks calculated: State & Type={all_benchmarks['state_hospital_type']['provider_count']}, State={all_benchmarks['state']['provider_count']}, Type={all_benchmarks['hospital_type']['provider_count']}, National={all_benchmarks['national']['provider_count']} peers")
-
-        # Create KPI cards
-        kpi_cards = []
-        kpi_rankings = []
-
-        # Define the 6 Level 1 KPIs from to_do.txt - ONLY show these
-        LEVEL_1_KPIS = {
-            'Net_Income_Margin',                      # L1 KPI 1: Net Income Margin
-            'AR_Days',                                # L1 KPI 2: Days in Net Patient AR
-            'Operating_Expense_per_Adjusted_Discharge',  # L1 KPI 3: Operating Expense per Adjusted Discharge
-            'Medicare_CCR',                           # L1 KPI 4: Medicare Cost-to-Charge Ratio
-            'Bad_Debt_Charity_Pct',                   # L1 KPI 5: Bad Debt + Charity %
-            'Current_Ratio'                           # L1 KPI 6: Current Ratio
-        }
+        logger.info(
+            "Benchmarks calculated: State & Type=%s, State=%s, Type=%s, National=%s peers",
+            all_benchmarks['state_hospital_type']['provider_count'], all_benchmarks['state']['provider_count'],
+            all_benchmarks['hospital_type']['provider_count'], all_benchmarks['national']['provider_count']
+        )
 
         # Create a reverse mapping to find database columns for each KPI key
         kpi_key_to_db_col = {}
@@ -137,99 +151,66 @@ def register_callbacks(app, data_manager, hospital_options):
                 kpi_key_to_db_col[kpi_key] = db_col
 
         # DEBUG: Log KPI key to column mapping
-        logger.debug(f"\n[DEBUG] KPI Key to DB Column Mapping:")
-        for k, v in kpi_key_to_db_col.items():
-            logger.info(f"  {k} -> {v}")
-
-        # Loop through ALL Level 1 KPIs to ensure all 6 show up
-        for kpi_key in LEVEL_1_KPIS:
-            # Skip if not in metadata
-            if kpi_key not in KPI_METADATA:
-                logger.debug(f"[DEBUG] Skipping {kpi_key} - not in KPI_METADATA")
-                continue
-
-            # Get KPI metadata
-            kpi_meta = KPI_METADATA.get(kpi_key, {})
-            higher_is_better = kpi_meta.get('higher_is_better', True)
-
-            # Check if we have data for this KPI
-            db_col = kpi_key_to_db_col.get(kpi_key)
-
-            if db_col and db_col in kpi_data.columns:
-                # We have data - use actual values
-                kpi_values = kpi_data[db_col].values
-                kpi_value = kpi_values[0] if len(kpi_values) > 0 else None
-                logger.debug(f"[DEBUG] {kpi_key}: Found column '{db_col}', value = {kpi_value}")
-            else:
-                # No data available - show as "Data Not Available"
-                kpi_values = [None] * len(kpi_data)
-                kpi_value = None
-                db_col = None  # Mark as no column available
-                logger.debug(f"[DEBUG] {kpi_key}: No column found (looked for '{kpi_key}' -> '{db_col}'), value = None")
-
-            # Get benchmark (use metadata key)
-            benchmark_kpis = benchmark_data.get('kpis', {})
-            kpi_benchmark = benchmark_kpis.get(kpi_key, {})
-            median = kpi_benchmark.get('Median')
-
-            # Calculate DYNAMIC priority
-            dynamic_priority = calculate_dynamic_priority(kpi_key, kpi_value, median, higher_is_better)
-
-            # Calculate performance gap
-            if kpi_value and median:
-                if higher_is_better:
-                    perf_gap = median - kpi_value
-                else:
-                    perf_gap = kpi_value - median
-            else:
-                perf_gap = 0
-
-            # Calculate trend
-            trend_direction, trend_pct = calculate_trend(kpi_values)
-
-            kpi_rankings.append({
-                'kpi_key': kpi_key,
-                'db_column': db_col,  # Will be None if no data
-                'dynamic_priority': dynamic_priority,
-                'importance': calculate_importance_score(kpi_key),
-                'perf_gap': abs(perf_gap),
-                'trend_pct': abs(trend_pct),
-                'kpi_value': kpi_value,
-                'kpi_values': kpi_values
-            })
-
-        # Determine sort order
-        ctx = dash.callback_context
-        if ctx.triggered:
-            button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-            if button_id == 'sort-performance':
-                kpi_rankings.sort(key=lambda x: x['perf_gap'], reverse=True)
-            elif button_id == 'sort-trend':
-                kpi_rankings.sort(key=lambda x: x['trend_pct'], reverse=True)
-            else:
-                kpi_rankings.sort(key=lambda x: x['dynamic_priority'], reverse=True)
-        else:
-            kpi_rankings.sort(key=lambda x: x['dynamic_priority'], reverse=True)
-
-        # Create cards in sorted order (use ENHANCED cards with all benchmark levels)
-        for idx, ranking in enumerate(kpi_rankings):
-            card = create_enhanced_level1_kpi_card(
-                kpi_key=ranking['kpi_key'],
-                kpi_value=ranking['kpi_value'],
-                kpi_trend_values=ranking['kpi_values'],
-                fiscal_years=kpi_data['Fiscal_Year'].values,
-                all_benchmarks=all_benchmarks,  # Pass all 4 benchmark levels
-                rank=idx + 1,
-                l2_kpis=l2_kpis,
-                l3_kpis=l3_kpis,
-                ccn=ccn,
-                fiscal_year=latest_year,
-                db_column=ranking['db_column'],  # Pass database column name for benchmark lookup
-                data_manager=data_manager,  # Pass data_manager for fetching base calculation data
-                kpi_data_df=kpi_data  # Pass the full kpi_data DataFrame
+        logger.debug("[DEBUG] KPI Key to DB Column Mapping: %s", kpi_key_to_db_col)
+
+        # Score ALL Level 1 KPIs at once on arrays (rows are fiscal years, columns
+        # are KPIs); KPIs without a column stay NaN and show as "Data Not Available"
+        kpi_keys = LEVEL_1_KPI_KEYS
+        db_columns = [kpi_key_to_db_col.get(kpi_key) for kpi_key in kpi_keys]
+        with_data = [i for i, db_col in enumerate(db_columns) if db_col is not None]
+
+        kpi_values = np.full((len(kpi_data), len(kpi_keys)), np.nan)
+        kpi_values[:, with_data] = kpi_data[[db_columns[i] for i in with_data]].to_numpy(dtype=float)
+        latest_values = kpi_values[0]
+
+        # Get benchmarks (use metadata key)
+        benchmark_kpis = benchmark_data.get('kpis', {})
+        medians = np.array(
+            [benchmark_kpis.get(kpi_key, {}).get('Median') for kpi_key in kpi_keys], dtype=float
+        )
+
+        # Calculate DYNAMIC priority, performance gap and trend for every KPI
+        dynamic_priority = calculate_dynamic_priorities(kpi_keys, latest_values, medians, LEVEL_1_HIGHER_IS_BETTER)
+        has_gap = ~np.isnan(latest_values) & ~np.isnan(medians) & (latest_values != 0) & (medians != 0)
+        perf_gap = np.where(has_gap, np.abs(medians - latest_values), 0.0)
+        trend_pct = np.abs(calculate_trend_pcts(kpi_values))
+
+        # Determine sort order (triggered_id is None on the initial call)
+        sort_scores = {
+            'sort-performance': perf_gap,
+            'sort-trend': trend_pct
+        }.get(dash.ctx.triggered_id, dynamic_priority)
+        order = np.argsort(-sort_scores, kind='stable')
+
+        # Arguments shared by every card (use ENHANCED cards with all benchmark levels)
+        make_card = partial(
+            create_enhanced_level1_kpi_card,
+            fiscal_years=fiscal_years,
+            all_benchmarks=all_benchmarks,  # Pass all 4 benchmark levels
+            l2_kpis=l2_kpis,
+            l3_kpis=l3_kpis,
+            ccn=ccn,
+            fiscal_year=latest_year,
+            data_manager=data_manager,  # Pass data_manager for fetching base calculation data
+            kpi_data_df=kpi_data  # Pass the full kpi_data DataFrame
+        )
+
+        # Create cards in sorted order; the cards are independent, so they are
+        # built on the shared pool and their figure construction can overlap
+        pending_cards = [
+            _card_pool.submit(
+                make_card,
+                kpi_key=kpi_keys[i],
+                kpi_value=latest_values[i],
+                kpi_trend_values=kpi_values[:, i],  # Column view of the value matrix
+                rank=rank,
+                db_column=db_columns[i]  # Pass database column name for benchmark lookup
             )
-            # 3 cards per row: width=12 (full on mobile), lg=4 (3 per row on desktop)
-            kpi_cards.append(dbc.Col(card, width=12, lg=4))
+            for rank, i in enumerate(order, start=1)
+        ]
+
+        # 3 cards per row: width=12 (full on mobile), lg=4 (3 per row on desktop)
+        kpi_cards = [dbc.Col(future.result(), width=12, lg=4) for future in pending_cards]
 
         # Layout cards in grid
         cards_grid = dbc.Row(kpi_cards)
@@ -304,28 +285,23 @@ def register_callbacks(app, data_manager, hospital_options):
     )
     def toggle_modal(view_clicks, close_clicks, _is_open, ccn):
         """Handle modal open/close and populate with KPI data table"""
-        ctx = dash.callback_context
-
-        if not ctx.triggered:
-            return dash.no_update, dash.no_update, dash.no_update
-
-        trigger_id = ctx.triggered[0]['prop_id']
+        # Already-parsed id of the triggering component: a string for
+        # close-modal, a dict for the pattern-matching view buttons
+        trigger_id = dash.ctx.triggered_id
 
         # If no actual click happened (just a re-render), don't update
-        if not trigger_id or trigger_id == '.':
+        if trigger_id is None:
             return dash.no_update, dash.no_update, dash.no_update
 
         # Close modal
-        if 'close-modal' in trigger_id:
+        if trigger_id == 'close-modal':
             return False, "", ""
 
         # Open modal with KPI data - only if a button was actually clicked
-        if 'view-data-btn' in trigger_id:
+        if isinstance(trigger_id, dict) and trigger_id.get('type') == 'view-data-btn':
             # Check if this was an actual click (not None and > 0)
             if view_clicks and any(clicks for clicks in view_clicks if clicks and clicks > 0):
-                # Extract KPI key from button ID
-                button_id = json.loads(trigger_id.split('.')[0])
-                kpi_key = button_id['index']
+                kpi_key = trigger_id['index']
 
                 # Get KPI data
                 kpi_data = data_manager.calculate_kpis(ccn)
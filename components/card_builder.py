@@ -18,6 +18,7 @@ from config.card_registry import CARD_REGISTRY, enrich_card_metadata
 from config.hierarchy_config import get_hierarchy, get_children, get_lineage, flatten_hierarchy
 from utils.kpi_helpers import calculate_percentile_rank, calculate_trend, create_sparkline
 from utils.formatting import format_number_compact
+from components.kpi_cards import create_enhanced_level1_kpi_card, create_hierarchical_kpi_card
 
 
 class CardBuilder:
@@ -187,10 +188,6 @@ class CardBuilder:
     def _build_enhanced_card(self, card_data, kpi_value, kpi_trend_values, fiscal_years,
                              all_benchmarks, **kwargs):
         """Build an enhanced L1 card with full benchmark comparison"""
-
-        # Import from existing kpi_cards to reuse
-        from components.kpi_cards import create_enhanced_level1_kpi_card
-
         return create_enhanced_level1_kpi_card(
             card_data['card_id'],
             kpi_value,
@@ -204,7 +201,6 @@ class CardBuilder:
     def _build_hierarchical_card(self, card_data, kpi_value, kpi_trend_values, fiscal_years,
                                  benchmark_data, **kwargs):
         """Build a hierarchical card with child KPIs"""
-
         card_id = card_data['card_id']
 
         # Get children from hierarchy
@@ -231,7 +227,6 @@ class CardBuilder:
                 child_components.append(child_card)
 
         # Build main card with collapsible children
-        from components.kpi_cards import create_hierarchical_kpi_card
 
         return create_hierarchical_kpi_card(
             card_data['card_id'],
@@ -20,6 +20,9 @@ HOSP_DATA_PATTERN = os.getenv('HOSP_DATA_PATTERN', 'HOSP10FY{year}')
 OUTPUT_DIR = DB_PARQUETS_DIR
 LOGS_DIR = PROJECT_ROOT / 'logs'
 
+# Dashboard hospital dropdown options, rebuilt when the source data changes
+HOSPITAL_OPTIONS_CACHE = DATA_DIR / '_hospital_options.pkl'
+
 # Parquet output directories (created by ETL scripts)
 # These are now in data/db_parquets/
 BALANCE_SHEET_OUTPUT = DB_PARQUETS_DIR / 'balance_sheet_long'
@@ -74,11 +74,10 @@ def get_provider_list():
     con.close()
 
     return [
-        {
-            'label': f"{row['Provider_Number']} ({row['state_code']})",
-            'value': row['Provider_Number']
-        }
-        for _, row in providers.iterrows()
+        {'label': f"{provider_number} ({state_code})", 'value': provider_number}
+        for provider_number, state_code in zip(
+            providers['Provider_Number'].tolist(), providers['state_code'].tolist()
+        )
     ]
 
 # ==============================================================================
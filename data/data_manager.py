@@ -8,6 +8,7 @@ from either DuckDB database (optimized) or parquet files (fallback).
 
 import logging
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import duckdb
 from typing import Optional, Dict, List, Union
@@ -20,6 +21,7 @@ from config.paths import (
     COSTS_B100_OUTPUT,
     PROJECT_ROOT
 )
+from utils.cache import cached_query, kpi_cache, benchmark_cache, level2_kpi_cache, level3_kpi_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -213,8 +215,8 @@ class HospitalDataManager:
             'Critical Access Hospital'
         """
         try:
-            ccn_str = str(int(ccn)).zfill(6)
-            prefix = int(ccn_str[:2])
+            # First 2 digits of the zero-padded 6-digit CCN
+            prefix = int(ccn) // 10000
 
             if prefix <= 2:
                 return "Short Term Acute Care"
@@ -234,10 +236,46 @@ class HospitalDataManager:
             logger.error(f"Invalid CCN format: {ccn} - {e}")
             return "Unknown"
 
+    def classify_hospital_types(self, ccns: pd.Series) -> pd.Series:
+        """
+        Classify hospital types for a Series of CCNs
+
+        Vectorized equivalent of classify_hospital_type(), using the same
+        CCN prefix ranges.
+
+        Args:
+            ccns: Provider numbers (strings or integers)
+
+        Returns:
+            Series of hospital type strings aligned with ccns
+        """
+        prefix = pd.to_numeric(ccns, errors='coerce') // 10000
+        conditions = [
+            prefix <= 2,
+            prefix <= 4,
+            prefix <= 6,
+            prefix == 13,
+            prefix <= 22,
+            prefix == 33,
+        ]
+        choices = [
+            "Short Term Acute Care",
+            "Rehabilitation",
+            "Psychiatric",
+            "Swing Bed",
+            "Long Term Care",
+            "Critical Access Hospital",
+        ]
+        hospital_types = np.select(conditions, choices, default="Other")
+        return pd.Series(np.where(prefix.isna(), "Unknown", hospital_types), index=ccns.index)
+
+    @cached_query(cache=kpi_cache)
     def calculate_kpis(self, ccn: str, year: Optional[int] = None) -> pd.DataFrame:
         """
         Calculate all Level 1 KPIs for a hospital
 
+        Results are cached in kpi_cache (shared by all callers in the process).
+
         Args:
             ccn: Provider number (6-digit string)
             year: Fiscal year (optional, defaults to latest available)
@@ -301,6 +339,7 @@ class HospitalDataManager:
         # Return empty DataFrame with expected structure
         return pd.DataFrame(columns=['Provider_Number', 'Fiscal_Year'])
 
+    @cached_query(cache=benchmark_cache)
     def get_benchmarks(
         self,
         ccn: str,
@@ -310,6 +349,8 @@ class HospitalDataManager:
         """
         Get benchmark data for a hospital at specified level
 
+        Results are cached in benchmark_cache (shared by all callers in the process).
+
         Benchmark levels:
         - 'National': Compare against all US hospitals
         - 'State': Compare against hospitals in same state
@@ -390,10 +431,13 @@ class HospitalDataManager:
         logger.warning("Please build the database using scripts/build_database.py for full functionality")
         return {}
 
+    @cached_query(cache=level2_kpi_cache)
     def calculate_level2_kpis(self, ccn: str, year: int) -> pd.DataFrame:
         """
         Calculate Level 2 KPIs (drivers of Level 1 KPIs)
 
+        Results are cached in level2_kpi_cache (shared by all callers in the process).
+
         Args:
             ccn: Provider number (6-digit string)
             year: Fiscal year
@@ -438,10 +482,13 @@ class HospitalDataManager:
         logger.warning("Level 2 KPI calculation from parquet files not implemented")
         return pd.DataFrame()
 
+    @cached_query(cache=level3_kpi_cache)
     def calculate_level3_kpis(self, ccn: str, year: int) -> pd.DataFrame:
         """
         Calculate Level 3 KPIs (drivers of Level 2 KPIs)
 
+        Results are cached in level3_kpi_cache (shared by all callers in the process).
+
         Args:
             ccn: Provider number (6-digit string)
             year: Fiscal year
@@ -158,8 +158,8 @@ def get_filter_options():
         """).df()
 
         state_options = [
-            {'label': f"{row['state_code']} ({row['count']:,} hospitals)", 'value': row['state_code']}
-            for _, row in states.iterrows()
+            {'label': f"{state_code} ({count:,} hospitals)", 'value': state_code}
+            for state_code, count in zip(states['state_code'].tolist(), states['count'].tolist())
         ]
 
         # Get unique hospital types
@@ -172,8 +172,8 @@ def get_filter_options():
         """).df()
 
         type_options = [
-            {'label': f"{row['hospital_type']} ({row['count']:,})", 'value': row['hospital_type']}
-            for _, row in types.iterrows()
+            {'label': f"{hospital_type} ({count:,})", 'value': hospital_type}
+            for hospital_type, count in zip(types['hospital_type'].tolist(), types['count'].tolist())
         ]
 
         # Get unique statuses
@@ -186,8 +186,8 @@ def get_filter_options():
         """).df()
 
         status_options = [
-            {'label': f"{row['status']} ({row['count']:,})", 'value': row['status']}
-            for _, row in statuses.iterrows()
+            {'label': f"{status} ({count:,})", 'value': status}
+            for status, count in zip(statuses['status'].tolist(), statuses['count'].tolist())
         ]
 
         return state_options, type_options, status_options
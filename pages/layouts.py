@@ -4,11 +4,15 @@ Page layouts for Hospital Dashboard
 This module contains the layout functions for different pages in the dashboard.
 """
 
+import os
+import pickle
+
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 
 from utils.logging_config import get_logger
 
+from config.paths import BALANCE_SHEET_OUTPUT, HOSPITAL_OPTIONS_CACHE
 from config.mappings import DB_COLUMN_TO_KPI_KEY
 from components.kpi_cards import create_enhanced_level1_kpi_card
 from kpi_hierarchy_config import KPI_HIERARCHY
@@ -16,9 +20,80 @@ from kpi_hierarchy_config import KPI_HIERARCHY
 logger = get_logger(__name__)
 
 
+# Bump when the cached options change shape, so older cache files are rebuilt
+HOSPITAL_OPTIONS_CACHE_VERSION = 1
+
+
+def _source_mtime(source):
+    """Newest modification time of the source file, or of anything under the source directory
+
+    A directory's own mtime only changes when entries are added or removed, so
+    a parquet file rewritten in place would otherwise leave a stale cache.
+    """
+    if not os.path.isdir(source):
+        return os.path.getmtime(source) if os.path.exists(source) else None
+    mtimes = []
+    for dirpath, _, filenames in os.walk(source):
+        mtimes.append(os.path.getmtime(dirpath))
+        mtimes.extend(os.path.getmtime(os.path.join(dirpath, name)) for name in filenames)
+    return max(mtimes)
+
+
+def _load_cached_hospital_options(source, source_mtime):
+    """Return the cached dropdown options if they were built from the current source"""
+    # Any unreadable, truncated or foreign cache file is treated as a miss
+    try:
+        with open(HOSPITAL_OPTIONS_CACHE, 'rb') as f:
+            cached = pickle.load(f)
+        if (cached['version'] == HOSPITAL_OPTIONS_CACHE_VERSION
+                and cached['source'] == source and cached['mtime'] == source_mtime):
+            return cached['options']
+    except Exception as e:
+        logger.debug(f"Ignoring hospital options cache: {e!r}")
+    return None
+
+
+def _save_cached_hospital_options(source, source_mtime, options):
+    """Write the dropdown options to disk, keyed on the source path, mtime and cache version
+
+    The file is written next to the cache and moved into place with os.replace,
+    so a concurrent reader never sees a partial pickle.
+    """
+    tmp_path = f"{HOSPITAL_OPTIONS_CACHE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'version': HOSPITAL_OPTIONS_CACHE_VERSION,
+                'source': source,
+                'mtime': source_mtime,
+                'options': options,
+            }, f)
+        os.replace(tmp_path, HOSPITAL_OPTIONS_CACHE)
+    except OSError as e:
+        logger.warning(f"Could not write hospital options cache: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def get_hospital_options(data_manager):
-    """Get list of hospitals from parquet files for dropdown"""
+    """Get list of hospitals from parquet files for dropdown
+
+    The options are cached in HOSPITAL_OPTIONS_CACHE and reused across process
+    starts until the DuckDB file (or any file under the balance sheet parquet
+    directory) changes.
+    """
     try:
+        source = str(data_manager.db_path if data_manager.use_database else BALANCE_SHEET_OUTPUT)
+        source_mtime = _source_mtime(source)
+
+        if source_mtime is not None:
+            options = _load_cached_hospital_options(source, source_mtime)
+            if options is not None:
+                logger.info(f"Loaded {len(options)} dropdown options from cache")
+                return options
+
         hospitals_df = data_manager.get_available_hospitals()
         logger.info(f"Found {len(hospitals_df)} hospitals in parquet files")
 
@@ -26,17 +101,20 @@ def get_hospital_options(data_manager):
             logger.info("No hospitals found, using default")
             return [{'label': '010001 - Default Hospital, State 01', 'value': '010001'}]
 
-        options = []
-        for _, row in hospitals_df.iterrows():
-            provider_num = row['Provider_Number']
-            ccn = str(int(provider_num)).zfill(6)
-            state = str(int(row['State_Code'])).zfill(2)
-            hosp_type = data_manager.classify_hospital_type(ccn)
-            year_count = row.get('Year_Count', 'N/A')
-            label = f"{ccn} - {hosp_type}, State {state} ({year_count} years)"
-            options.append({'label': label, 'value': ccn})
+        # Build all labels with column operations instead of iterating rows
+        ccns = hospitals_df['Provider_Number'].astype('int64').astype(str).str.zfill(6)
+        states = hospitals_df['State_Code'].astype('int64').astype(str).str.zfill(2)
+        hosp_types = data_manager.classify_hospital_types(ccns)
+        if 'Year_Count' in hospitals_df:
+            year_counts = hospitals_df['Year_Count'].astype(str)
+        else:
+            year_counts = 'N/A'
+        labels = ccns + ' - ' + hosp_types + ', State ' + states + ' (' + year_counts + ' years)'
+        options = [{'label': label, 'value': ccn} for label, ccn in zip(labels, ccns)]
 
         logger.info(f"Generated {len(options)} dropdown options")
+        if source_mtime is not None:
+            _save_cached_hospital_options(source, source_mtime, options)
         return options
     except Exception as e:
         logger.error(f"Error loading hospitals: {e}")
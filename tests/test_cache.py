@@ -0,0 +1,111 @@
+"""
+Unit tests for utils/cache.py
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache import LRUCache, QueryCache, cached_query
+
+
+class TestLRUCache:
+    """Test the LRU cache shared between callback threads"""
+
+    def test_delete(self):
+        """Test that a deleted key is no longer returned"""
+        cache = LRUCache(max_size=10, ttl=60)
+        cache.set('session', {'email': 'a@b.org'})
+        cache.delete('session')
+        cache.delete('missing')
+        assert cache.get('session') is None
+
+    def test_concurrent_access(self):
+        """Test that concurrent sets, gets and evictions don't corrupt the cache"""
+        cache = LRUCache(max_size=50, ttl=60)
+
+        def worker(n):
+            for i in range(500):
+                key = (n * 7 + i) % 200
+                cache.set(key, i)
+                cache.get(key)
+                cache.delete((key + 3) % 200)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(worker, range(8)))
+
+        assert len(cache) <= 50
+        assert set(cache.cache) == set(cache.timestamps)
+
+
+class TestQueryCacheKeys:
+    """Test cache key generation"""
+
+    def test_scalar_args_use_tuple_key(self):
+        """Test that hashable arguments are used as the key directly"""
+        cache = QueryCache()
+        assert cache._make_key('010001', 2022, 'State') == ('010001', 2022, 'State')
+
+    def test_kwargs_order_does_not_matter(self):
+        """Test that keyword order produces the same key"""
+        cache = QueryCache()
+        assert cache._make_key('010001', year=2022, level='State') == \
+            cache._make_key('010001', level='State', year=2022)
+
+    def test_unhashable_args_fall_back_to_hash(self):
+        """Test that unhashable arguments still produce a stable key"""
+        cache = QueryCache()
+        key = cache._make_key(['010001', '010002'])
+        assert isinstance(key, str)
+        assert key == cache._make_key(['010001', '010002'])
+
+
+class TestCachedQuery:
+    """Test the cached_query decorator"""
+
+    def test_repeat_call_hits_cache(self):
+        """Test that a repeated call does not run the function again"""
+        calls = []
+
+        @cached_query(cache=QueryCache())
+        def lookup(ccn, level):
+            calls.append((ccn, level))
+            return {'ccn': ccn, 'level': level}
+
+        assert lookup('010001', 'State') == lookup('010001', 'State')
+        lookup('010001', 'National')
+        assert calls == [('010001', 'State'), ('010001', 'National')]
+
+    def test_unhashable_args(self):
+        """Test that list arguments are cached through the JSON key"""
+        calls = []
+
+        @cached_query(cache=QueryCache())
+        def total(values):
+            calls.append(values)
+            return sum(values)
+
+        assert total([1, 2, 3]) == 6
+        assert total([1, 2, 3]) == 6
+        assert len(calls) == 1
+
+    def test_concurrent_misses_run_once(self):
+        """Test that concurrent calls with the same arguments share one computation"""
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached_query(cache=QueryCache())
+        def rankings(ccn, level):
+            calls.append((ccn, level))
+            started.set()
+            release.wait(5)
+            return {'ccn': ccn}
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            first = pool.submit(rankings, '010001', 'State')
+            started.wait(5)
+            others = [pool.submit(rankings, '010001', 'State') for _ in range(3)]
+            release.set()
+            results = [first.result()] + [f.result() for f in others]
+
+        assert calls == [('010001', 'State')]
+        assert all(r == {'ccn': '010001'} for r in results)
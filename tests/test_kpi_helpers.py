@@ -0,0 +1,53 @@
+"""
+Unit tests for the vectorized helpers in utils/kpi_helpers.py
+"""
+
+import pytest
+import numpy as np
+from kpi_hierarchy_config import KPI_METADATA
+from utils.kpi_helpers import (
+    calculate_dynamic_priority,
+    calculate_dynamic_priorities,
+    calculate_trend,
+    calculate_trend_pcts
+)
+
+
+class TestCalculateDynamicPriorities:
+    """Test that the vectorized priorities match calculate_dynamic_priority"""
+
+    def test_matches_scalar_version(self):
+        """Test every branch against the scalar function"""
+        kpi_keys = list(KPI_METADATA)[:6]
+        values = np.array([50.0, 150.0, 80.0, np.nan, 10.0, 10.0])
+        medians = np.array([100.0, 100.0, 100.0, 100.0, np.nan, 0.0])
+        higher_is_better = np.array([True, True, False, True, True, False])
+
+        result = calculate_dynamic_priorities(kpi_keys, values, medians, higher_is_better)
+
+        for i, kpi_key in enumerate(kpi_keys):
+            expected = calculate_dynamic_priority(kpi_key, values[i], medians[i], higher_is_better[i])
+            assert result[i] == pytest.approx(expected)
+
+
+class TestCalculateTrendPcts:
+    """Test that the vectorized trend matches calculate_trend"""
+
+    def test_matches_scalar_version(self):
+        """Test each KPI column against the scalar function"""
+        values = np.array([
+            [110.0, 90.0, np.nan, 5.0],
+            [100.0, 100.0, 100.0, 0.0],
+            [95.0, 80.0, 90.0, 4.0],
+        ])
+
+        result = calculate_trend_pcts(values)
+
+        for i in range(values.shape[1]):
+            _, expected = calculate_trend(values[:, i])
+            assert result[i] == pytest.approx(expected)
+
+    def test_single_year(self):
+        """Test that a single fiscal year has no trend"""
+        result = calculate_trend_pcts(np.array([[1.0, 2.0]]))
+        assert list(result) == [0.0, 0.0]
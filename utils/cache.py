@@ -6,9 +6,10 @@ to improve dashboard performance.
 """
 
 import logging
-from typing import Any, Optional, Callable, Dict, Tuple
+from typing import Any, Optional, Callable, Dict, Hashable, Tuple
 import hashlib
 import json
+import threading
 import time
 from functools import wraps
 from collections import OrderedDict
@@ -21,7 +22,7 @@ class LRUCache:
     Least Recently Used (LRU) Cache implementation
 
     Stores items in memory with automatic eviction of least recently used items
-    when the cache reaches max_size.
+    when the cache reaches max_size. Safe to share between callback threads.
 
     Attributes:
         max_size (int): Maximum number of items to store
@@ -39,11 +40,12 @@ class LRUCache:
         self.max_size = max_size
         self.ttl = ttl
         self.cache: OrderedDict = OrderedDict()
-        self.timestamps: Dict[str, float] = {}
+        self.timestamps: Dict[Hashable, float] = {}
         self.hits = 0
         self.misses = 0
+        self._lock = threading.RLock()
 
-    def _is_expired(self, key: str) -> bool:
+    def _is_expired(self, key: Hashable) -> bool:
         """Check if cached item has expired"""
         if self.ttl is None:
             return False
@@ -54,7 +56,7 @@ class LRUCache:
         age = time.time() - self.timestamps[key]
         return age > self.ttl
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get item from cache
 
@@ -64,23 +66,24 @@ class LRUCache:
         Returns:
             Cached value or None if not found/expired
         """
-        if key not in self.cache:
-            self.misses += 1
-            return None
-
-        # Check expiration
-        if self._is_expired(key):
-            self.misses += 1
-            del self.cache[key]
-            del self.timestamps[key]
-            return None
-
-        # Move to end (mark as recently used)
-        self.cache.move_to_end(key)
-        self.hits += 1
-        return self.cache[key]
-
-    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            if key not in self.cache:
+                self.misses += 1
+                return None
+
+            # Check expiration
+            if self._is_expired(key):
+                self.misses += 1
+                del self.cache[key]
+                del self.timestamps[key]
+                return None
+
+            # Move to end (mark as recently used)
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return self.cache[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
         """
         Store item in cache
 
@@ -88,24 +91,37 @@ class LRUCache:
             key: Cache key
             value: Value to cache
         """
-        # Remove oldest item if at capacity
-        if key not in self.cache and len(self.cache) >= self.max_size:
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
-            del self.timestamps[oldest_key]
-            logger.debug(f"Evicted oldest cache entry: {oldest_key}")
-
-        # Add/update item
-        self.cache[key] = value
-        self.cache.move_to_end(key)
-        self.timestamps[key] = time.time()
+        with self._lock:
+            # Remove oldest item if at capacity
+            if key not in self.cache and len(self.cache) >= self.max_size:
+                oldest_key = next(iter(self.cache))
+                del self.cache[oldest_key]
+                del self.timestamps[oldest_key]
+                logger.debug("Evicted oldest cache entry: %s", oldest_key)
+
+            # Add/update item
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+            self.timestamps[key] = time.time()
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove item from cache if present
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self.cache.pop(key, None)
+            self.timestamps.pop(key, None)
 
     def clear(self) -> None:
         """Clear all cached items"""
-        self.cache.clear()
-        self.timestamps.clear()
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self.cache.clear()
+            self.timestamps.clear()
+            self.hits = 0
+            self.misses = 0
         logger.info("Cache cleared")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -149,17 +165,27 @@ class QueryCache:
         """
         self.cache = LRUCache(max_size=max_size, ttl=ttl)
 
-    def _make_key(self, *args, **kwargs) -> str:
+    def _make_key(self, *args, **kwargs) -> Hashable:
         """
         Generate cache key from function arguments
 
+        Scalar arguments (the usual ccn / year / benchmark level) are used as a
+        tuple key directly; anything unhashable falls back to a JSON hash.
+
         Args:
             *args: Positional arguments
             **kwargs: Keyword arguments
 
         Returns:
-            str: Hash key for cache lookup
+            Hashable: Key for cache lookup
         """
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        try:
+            hash(key)
+            return key
+        except TypeError:
+            pass
+
         # Convert args and kwargs to JSON-serializable format
         key_data = {
             'args': args,
@@ -187,9 +213,9 @@ class QueryCache:
         result = self.cache.get(key)
 
         if result is not None:
-            logger.debug(f"Cache HIT: {args[:2]}")  # Log first 2 args
+            logger.debug("Cache HIT: %s", args[:2])  # Log first 2 args
         else:
-            logger.debug(f"Cache MISS: {args[:2]}")
+            logger.debug("Cache MISS: %s", args[:2])
 
         return result
 
@@ -204,7 +230,7 @@ class QueryCache:
         """
         key = self._make_key(*args, **kwargs)
         self.cache.set(key, result)
-        logger.debug(f"Cached result: {args[:2]}")
+        logger.debug("Cached result: %s", args[:2])
 
     def clear(self) -> None:
         """Clear all cached queries"""
@@ -219,6 +245,10 @@ class QueryCache:
 kpi_cache = QueryCache(max_size=500, ttl=3600)  # 1 hour TTL
 benchmark_cache = QueryCache(max_size=500, ttl=3600)
 financial_statement_cache = QueryCache(max_size=200, ttl=1800)  # 30 min TTL
+# Level 2/3 driver KPIs; separate caches because the keys are only the call
+# arguments, which are the same (ccn, year) for both levels
+level2_kpi_cache = QueryCache(max_size=500, ttl=3600)
+level3_kpi_cache = QueryCache(max_size=500, ttl=3600)
 
 
 def cached_query(cache: QueryCache = None, ttl: Optional[int] = None):
@@ -242,6 +272,12 @@ def cached_query(cache: QueryCache = None, ttl: Optional[int] = None):
         cache = QueryCache(ttl=ttl or 3600)
 
     def decorator(func: Callable) -> Callable:
+        # One lock per key being computed, so concurrent misses for the same
+        # arguments (e.g. two callbacks fired by one dropdown change) run the
+        # function once and the others wait for its cached result
+        in_flight: Dict[Hashable, threading.Lock] = {}
+        in_flight_lock = threading.Lock()
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Try to get from cache
@@ -249,11 +285,25 @@ def cached_query(cache: QueryCache = None, ttl: Optional[int] = None):
             if cached_result is not None:
                 return cached_result
 
-            # Not in cache, execute function
-            result = func(*args, **kwargs)
+            key = cache._make_key(*args, **kwargs)
+            with in_flight_lock:
+                key_lock = in_flight.setdefault(key, threading.Lock())
+
+            with key_lock:
+                # Another thread may have filled the cache while we waited
+                cached_result = cache.get(*args, **kwargs)
+                if cached_result is not None:
+                    return cached_result
+
+                try:
+                    # Not in cache, execute function
+                    result = func(*args, **kwargs)
 
-            # Cache the result
-            cache.set(result, *args, **kwargs)
+                    # Cache the result
+                    cache.set(result, *args, **kwargs)
+                finally:
+                    with in_flight_lock:
+                        in_flight.pop(key, None)
 
             return result
 
@@ -272,6 +322,8 @@ def clear_all_caches():
     kpi_cache.clear()
     benchmark_cache.clear()
     financial_statement_cache.clear()
+    level2_kpi_cache.clear()
+    level3_kpi_cache.clear()
     logger.info("All caches cleared")
 
 
@@ -285,5 +337,7 @@ def get_all_cache_stats() -> Dict[str, Dict]:
     return {
         'kpi_cache': kpi_cache.get_stats(),
         'benchmark_cache': benchmark_cache.get_stats(),
-        'financial_statement_cache': financial_statement_cache.get_stats()
+        'financial_statement_cache': financial_statement_cache.get_stats(),
+        'level2_kpi_cache': level2_kpi_cache.get_stats(),
+        'level3_kpi_cache': level3_kpi_cache.get_stats()
     }
@@ -32,7 +32,7 @@ def safe_db_operation(error_message="Database operation failed"):
             try:
                 return operation(*args, **kwargs)
             except Exception as e:
-                logging.error(f"{error_message}: {e}", exc_info=True)
+                logging.exception("%s: %s", error_message, e)
                 raise
         return wrapper
     return decorator
\ No newline at end of file
@@ -2,17 +2,25 @@
 KPI Helper Functions - Calculations and utilities for KPI processing
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from kpi_hierarchy_config import KPI_METADATA
 
 
+# Unrated KPIs default to impact 5 and ease 5
+DEFAULT_IMPORTANCE = 5 * 5
+
+# BASE importance of every configured KPI, computed once from the static metadata
+BASE_IMPORTANCE = {
+    kpi_key: meta.get('impact_score', 5) * meta.get('ease_of_change', 5)
+    for kpi_key, meta in KPI_METADATA.items()
+}
+
+
 def calculate_importance_score(kpi_key):
     """Calculate BASE importance score = Impact × Ease of Change"""
-    meta = KPI_METADATA.get(kpi_key, {})
-    impact = meta.get('impact_score', 5)
-    ease = meta.get('ease_of_change', 5)
-    return impact * ease
+    return BASE_IMPORTANCE.get(kpi_key, DEFAULT_IMPORTANCE)
 
 
 def calculate_dynamic_priority(kpi_key, hospital_value, benchmark_median, higher_is_better=True):
@@ -48,6 +56,40 @@ def calculate_dynamic_priority(kpi_key, hospital_value, benchmark_median, higher
     return priority
 
 
+def calculate_dynamic_priorities(kpi_keys, hospital_values, benchmark_medians, higher_is_better):
+    """
+    Vectorized calculate_dynamic_priority() for many KPIs at once
+
+    Args:
+        kpi_keys: Sequence of KPI keys
+        hospital_values: Hospital value per KPI (NaN when missing)
+        benchmark_medians: Benchmark median per KPI (NaN when missing)
+        higher_is_better: Boolean per KPI
+
+    Returns: numpy array of priority scores aligned with kpi_keys
+    """
+    base_importance = np.fromiter(
+        (BASE_IMPORTANCE.get(k, DEFAULT_IMPORTANCE) for k in kpi_keys), dtype=float, count=len(kpi_keys)
+    )
+    hospital_values = np.asarray(hospital_values, dtype=float)
+    benchmark_medians = np.asarray(benchmark_medians, dtype=float)
+    higher_is_better = np.asarray(higher_is_better, dtype=bool)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gap_pct = np.abs((hospital_values - benchmark_medians) / benchmark_medians) * 100
+
+    underperforming = np.where(
+        higher_is_better,
+        hospital_values < benchmark_medians,
+        hospital_values > benchmark_medians
+    )
+    gap_multiplier = np.where(underperforming, 1 + np.minimum(gap_pct / 100, 0.5), 0.5)
+
+    # Without a usable value/benchmark pair the priority is the base importance
+    comparable = ~np.isnan(hospital_values) & ~np.isnan(benchmark_medians) & (benchmark_medians != 0)
+    return np.where(comparable, base_importance * gap_multiplier, base_importance)
+
+
 def calculate_percentile_rank(value, p25, median, p75):
     """Determine which quartile the value falls into"""
     if pd.isna(value) or p25 is None or median is None or p75 is None:
@@ -84,6 +126,29 @@ def calculate_trend(values):
         return 'down', change_pct
 
 
+def calculate_trend_pcts(values):
+    """
+    Vectorized trend magnitude from calculate_trend() for many KPIs at once
+
+    Args:
+        values: 2D array with one row per fiscal year and one column per KPI
+
+    Returns: numpy array of change percentages per KPI (0 when undefined)
+    """
+    values = np.asarray(values, dtype=float)
+    if values.shape[0] < 2:
+        return np.zeros(values.shape[1])
+
+    recent = values[0]
+    older = values[1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = ((recent - older) / np.abs(older)) * 100
+
+    comparable = ~np.isnan(recent) & ~np.isnan(older) & (older != 0)
+    return np.where(comparable, change_pct, 0.0)
+
+
 def create_sparkline(values, fiscal_years):
     """Create a mini sparkline chart for trend"""
     if len(values) < 2:
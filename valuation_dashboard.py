@@ -145,17 +145,29 @@ app.layout = html.Div([
 ], style={'backgroundColor': '#f8f9fa', 'minHeight': '100vh', 'fontFamily': 'Arial, sans-serif'})
 
 
+# Hospital dropdown options, built on first successful load and reused
+_hospital_options = ()
+
+
+def get_hospital_options():
+    """Hospital dropdown options, built once per process"""
+    global _hospital_options
+    if not _hospital_options:
+        hospitals = load_hospital_list()
+        _hospital_options = tuple(
+            {'label': f"Provider {provider_number}", 'value': provider_number}
+            for provider_number in hospitals['Provider_Number'].tolist()
+        )
+    return _hospital_options
+
+
 # Callback to populate hospital dropdown
 @app.callback(
     Output('hospital-dropdown', 'options'),
     Input('hospital-dropdown', 'id')
 )
 def populate_hospitals(_):
-    hospitals = load_hospital_list()
-    if hospitals.empty:
-        return []
-    return [{'label': f"Provider {row['Provider_Number']}", 'value': row['Provider_Number']}
-            for _, row in hospitals.iterrows()]
+    return list(get_hospital_options())
 
 
 # Callback to populate year dropdown based on selected hospital
@@ -190,6 +202,17 @@ def populate_years(provider_number):
         return [], None
 
 
+# Income statement lines used for the baseline metrics, by baseline key
+BASELINE_LINES = {
+    'Net_Patient_Revenue': 'net_revenue',
+    'Operating_Income': 'operating_income',
+    'Net_Income': 'net_income',
+    'Total_Operating_Expenses': 'operating_expenses',
+    'Total_Other_Income': 'other_income',
+    'Total_Other_Expenses': 'other_expenses'
+}
+
+
 # Main callback to load data and render dashboard
 @app.callback(
     [Output('income-statement-data', 'data'),
@@ -218,20 +241,11 @@ def load_and_render_dashboard(n_clicks, provider_number, fiscal_year):
         ])
 
     # Calculate baseline metrics
-    baseline = {}
-    for _, row in income_df.iterrows():
-        if row['Line_Name'] == 'Net_Patient_Revenue':
-            baseline['net_revenue'] = row['Value']
-        elif row['Line_Name'] == 'Operating_Income':
-            baseline['operating_income'] = row['Value']
-        elif row['Line_Name'] == 'Net_Income':
-            baseline['net_income'] = row['Value']
-        elif row['Line_Name'] == 'Total_Operating_Expenses':
-            baseline['operating_expenses'] = row['Value']
-        elif row['Line_Name'] == 'Total_Other_Income':
-            baseline['other_income'] = row['Value']
-        elif row['Line_Name'] == 'Total_Other_Expenses':
-            baseline['other_expenses'] = row['Value']
+    baseline = {
+        BASELINE_LINES[line_name]: value
+        for line_name, value in zip(income_df['Line_Name'].tolist(), income_df['Value'].tolist())
+        if line_name in BASELINE_LINES
+    }
 
     # Calculate baseline EBITDA (simplified - would need depreciation/interest from other worksheets)
     # For now, use Operating Income as proxy